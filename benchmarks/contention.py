@@ -0,0 +1,59 @@
+"""
+Contention benchmark for ThreadSafeRobot, N threads send batches of orders to one shared robot
+
+    python benchmarks/contention.py [max_threads] [batches_per_thread] [batch_size]
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.robot import ThreadSafeRobot
+
+ORDERS = ["MOVE", "RIGHT"] * 4 + ["REPORT"]
+
+
+def run(threads: int, batches: int, batch_size: int) -> float:
+    """
+    Let the threads drive a shared robot
+    :param threads: number of threads
+    :param batches: number of batches each thread sends
+    :param batch_size: number of commands in a batch
+    :return: commands executed per second
+    """
+    robot = ThreadSafeRobot(Navigator(Table(100, 100)), Position(50, 50, Facing.NORTH))
+    batch = (ORDERS * (batch_size // len(ORDERS) + 1))[:batch_size]
+
+    def worker():
+        for _ in range(batches):
+            robot.await_orders(batch)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * batches * batch_size / (time.perf_counter() - start)
+
+
+def main():
+    """
+    Print the commands executed per second for 1, 2, 4... threads
+    :return: no return value
+    """
+    args = [int(arg) for arg in sys.argv[1:]]
+    max_threads, batches, batch_size = args + [8, 200, 100][len(args) :]
+    threads = 1
+    while threads <= max_threads:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            with redirect_stdout(devnull):
+                throughput = run(threads, batches, batch_size)
+        print(f"{threads:>3} threads: {throughput:>12,.0f} commands/s")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark of the execution kernels, execute MOVE, LEFT and RIGHT commands one by one and with the kernels across
+table sizes
+
+    python benchmarks/kernels.py [commands]
+"""
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+from toy_robot.kernels import execute_commands
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.robot import Robot
+
+TABLE_SIZES = [5, 100, 1000, 10000]
+
+
+def _execute_one_by_one(robot, commands):
+    for command in commands:
+        command.execute()
+
+
+def main():
+    """
+    Print the commands executed per second for each table size
+    :return: no return value
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rand = random.Random(0)
+    lines = rand.choices(["MOVE", "MOVE", "LEFT", "RIGHT"], k=count)
+    for size in TABLE_SIZES:
+        results = []
+        for execute in (_execute_one_by_one, execute_commands):
+            robot = Robot(
+                Navigator(Table(size, size)),
+                Position(size // 2, size // 2, Facing.NORTH),
+            )
+            commands = robot.command_interpreter.interpret(lines)
+            with open(os.devnull, "w", encoding="utf-8") as devnull:
+                with redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    execute(robot, commands)
+                    results.append(count / (time.perf_counter() - start))
+        print(
+            f"{size:>6}x{size:<6} one by one: {results[0]:>12,.0f} commands/s, "
+            f"kernel: {results[1]:>12,.0f} commands/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Translation benchmark for CommandsInterpreter, interpret a PLACE heavy command list on tables of different sizes, the
+lines of the small tables repeat and are mostly shared, the lines of the large tables are mostly distinct and parsed
+
+    python benchmarks/translation.py [lines] [table_size ...]
+"""
+import random
+import sys
+import time
+
+from toy_robot.models import Facing, Navigator, Table
+from toy_robot.robot import Robot
+
+SIMPLE_LINES = ["MOVE\n", "LEFT\n", "RIGHT\n", "REPORT\n"]
+TABLE_SIZES = [5, 100, 1000]
+
+
+def run(lines: int, table_size: int) -> float:
+    """
+    Interpret a PLACE heavy command list
+    :param lines: the number of lines
+    :param table_size: width and length of the table
+    :return: seconds
+    """
+    rand = random.Random(0)
+    facings = [f.name for f in Facing]
+    command_list = [
+        f"PLACE {rand.randrange(table_size)},{rand.randrange(table_size)},{rand.choice(facings)}\n"
+        if rand.random() < 0.7
+        else rand.choice(SIMPLE_LINES)
+        for _ in range(lines)
+    ]
+    interpreter = Robot(Navigator(Table(table_size, table_size))).command_interpreter
+    start = time.perf_counter()
+    interpreter.interpret(command_list)
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Print the lines interpreted per second for each table size
+    :return: no return value
+    """
+    args = [int(arg) for arg in sys.argv[1:]]
+    lines = args[0] if args else 1_000_000
+    for table_size in args[1:] or TABLE_SIZES:
+        elapsed = run(lines, table_size)
+        print(
+            f"{table_size}x{table_size}: {lines:,} lines in {elapsed:.3f}s, {lines / elapsed:,.0f} lines/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
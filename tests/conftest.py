@@ -1,3 +1,6 @@
+import os
+from typing import Callable
+
 import pytest
 
 from toy_robot.command_interpreter import CommandsInterpreter
@@ -14,3 +17,14 @@ def robot() -> Robot:
 @pytest.fixture
 def command_interpreter(robot):
     return CommandsInterpreter(robot)
+
+
+@pytest.fixture
+def write_file() -> Callable[[str, str], str]:
+    def write(filepath: str, text: str) -> str:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+        return filepath
+
+    return write
@@ -0,0 +1,79 @@
+import os
+from collections import Counter
+
+import pytest
+
+from toy_robot.aggregate import (
+    OFF_TABLE,
+    BatchSummary,
+    QuantileSketch,
+    summarize,
+    summarize_files,
+)
+
+DIR = os.path.dirname(os.path.realpath(__file__))
+
+RESOURCE_FILES = [
+    os.path.join(DIR, "resources", f"commands_0{i}.txt") for i in range(1, 7)
+]
+
+
+def test_quantile_sketch_is_within_relative_accuracy():
+    sketch = QuantileSketch(0.01)
+    for value in range(1, 10001):
+        sketch.add(value)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(q * 9999 + 1, rel=0.02)
+
+
+def test_quantile_sketch_merge():
+    merged, evens, odds = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(100):
+        merged.add(value)
+        (evens if value % 2 == 0 else odds).add(value)
+    evens.merge(odds)
+    assert evens.count == merged.count == 100
+    assert evens.quantile(0.5) == merged.quantile(0.5)
+    assert QuantileSketch().quantile(0.5) is None
+    assert evens.quantile(0) == 0
+
+    with pytest.raises(ValueError):
+        evens.merge(QuantileSketch(0.05))
+
+
+def test_summarize_files():
+    summary = summarize_files(RESOURCE_FILES)
+    assert (summary.files, summary.failed_files) == (6, 0)
+    assert (summary.reports, summary.refusals, summary.ignored) == (5, 3, 3)
+    assert summary.final_positions == Counter(
+        {
+            "0,1,NORTH": 1,
+            "0,0,WEST": 1,
+            "3,3,NORTH": 1,
+            "4,3,NORTH": 1,
+            "1,1,WEST": 1,
+            OFF_TABLE: 1,
+        }
+    )
+    assert summary.path_lengths.count == 6
+    assert summary.path_lengths.quantile(0.5) == pytest.approx(1, rel=0.01)
+
+
+def test_summarize_files_counts_failed_files(tmp_path, write_file):
+    summary = summarize_files(
+        [
+            write_file(os.path.join(tmp_path, "a.txt"), "PLACE 0,0,NORTH\nJUMP\n"),
+            write_file(os.path.join(tmp_path, "b.txt"), "PLACE 9,9,NORTH\n"),
+        ]
+    )
+    assert (summary.files, summary.failed_files) == (2, 2)
+    assert "Files: 2, failed: 2 (100.0%)" in str(summary)
+
+
+def test_summarize_merges_the_workers():
+    summary = summarize(RESOURCE_FILES * 3, workers=2, chunk_size=4)
+    expected = BatchSummary()
+    for _ in range(3):
+        expected.merge(summarize_files(RESOURCE_FILES))
+    assert str(summary) == str(expected)
+    assert summary.final_positions == expected.final_positions
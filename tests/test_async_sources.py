@@ -0,0 +1,94 @@
+import asyncio
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from toy_robot.async_sources import (
+    lines_from_file,
+    lines_from_queue,
+    lines_from_stream,
+)
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.robot import Robot
+
+
+async def _collect(lines):
+    return [line async for line in lines]
+
+
+def test_lines_from_stream():
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"PLACE 0,0,NORTH\nMOVE\nREPORT")
+        reader.feed_eof()
+        return await _collect(lines_from_stream(reader))
+
+    assert asyncio.run(read()) == ["PLACE 0,0,NORTH\n", "MOVE\n", "REPORT"]
+
+
+def test_lines_from_queue():
+    async def read():
+        queue: asyncio.Queue = asyncio.Queue()
+        for line in ["PLACE 0,0,NORTH", "MOVE", None, "REPORT"]:
+            queue.put_nowait(line)
+        return await _collect(lines_from_queue(queue))
+
+    assert asyncio.run(read()) == ["PLACE 0,0,NORTH", "MOVE"]
+
+
+def test_lines_from_file(tmp_path):
+    filepath = os.path.join(tmp_path, "commands.txt")
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write("MOVE\n" * 100)
+
+    lines = asyncio.run(_collect(lines_from_file(filepath, chunk_size=16)))
+    assert lines == ["MOVE\n"] * 100
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_await_orders_async(stdout):
+    robot = Robot(Navigator(Table()))
+
+    async def play():
+        queue: asyncio.Queue = asyncio.Queue()
+        for line in ["PLACE 0,0,NORTH", "MOVE", "", "RIGHT", "REPORT", None]:
+            queue.put_nowait(line)
+        await robot.await_orders_async(lines_from_queue(queue))
+
+    asyncio.run(play())
+    assert stdout.getvalue() == "Output: 0,1,EAST\n"
+
+
+def test_await_orders_async_yields_to_other_robots():
+    robots = [Robot(Navigator(Table()), Position(0, 0, Facing.NORTH)) for _ in range(2)]
+    turns = []
+
+    async def source(name):
+        for _ in range(4):
+            turns.append(name)
+            yield "LEFT"
+
+    async def play():
+        await asyncio.gather(
+            robots[0].await_orders_async(source("a"), yield_every=1),
+            robots[1].await_orders_async(source("b"), yield_every=1),
+        )
+
+    asyncio.run(play())
+    assert turns == ["a", "b"] * 4
+    assert all(robot.current_position.facing == Facing.NORTH for robot in robots)
+
+
+@pytest.mark.parametrize("yield_every", [0, -1])
+def test_await_orders_async_when_yield_every_is_less_than_1(yield_every):
+    robot = Robot(Navigator(Table()))
+
+    async def source():
+        yield "PLACE 0,0,NORTH"
+
+    with pytest.raises(ValueError) as exc_info:
+        asyncio.run(robot.await_orders_async(source(), yield_every=yield_every))
+    assert exc_info.value.args[0] == "yield_every should be at least 1"
+    assert robot.current_position is None
@@ -3,7 +3,10 @@ import sys
 from io import StringIO
 from unittest import mock
 
-from toy_robot.cli import automatic_mode, interactive_mode
+from toy_robot.cli import automatic_mode, interactive_mode, play, main, _play_file
+from toy_robot.models import Navigator, Table
+from toy_robot.result_cache import ResultCache
+from toy_robot.robot import Robot
 
 DIR = os.path.dirname(os.path.realpath(__file__))
 
@@ -122,3 +125,147 @@ def test_interactive_mode_reordered_commands(stdout):
         "Output: 0,1,NORTH\n"
         "Output: 1,1,EAST\n"
     )
+
+
+_BANNER = (
+    "\nThe SOUTH WEST most corner on the table is considered (0, 0)\n"
+    "PLACE command to set the robot position on the table;\n"
+    "MOVE command to order the robot move one step forward;\n"
+    "LEFT command to order the robot turn left;\n"
+    "RIGHT command to order the robot turn right;\n"
+    "REPORT command to order the robot report its current position;\n"
+    "Ctrl+C or EOF to exit\n"
+    "\n"
+    "Please input your command: \n"
+)
+
+
+class _TtyStringIO(StringIO):
+    def isatty(self):
+        return True
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_play_when_piped_stdin_has_bad_lines(stdout):
+    sys.stdin = StringIO(
+        "PLACE 0,0,NORTH\n"
+        "JUMP\n"
+        "MOVE\n"
+        "PLACE 9,9,NORTH\n"
+        "REPORT\n"
+        "EOF\n"
+        "REPORT\n"
+    )
+    play(Robot(Navigator(Table())))
+    assert stdout.getvalue() == _BANNER + (
+        "Unsupported command of JUMP, supported commands: ['PLACE', 'GOTO', 'MOVE', 'LEFT', 'RIGHT', 'REPORT']\n"
+        "Please try a again.\n"
+        "Please put the robot on the table, in case of damaging it. The table max x and y is 4, 4\n"
+        "Please try a again.\n"
+        "Output: 0,1,NORTH\n"
+    )
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_play_when_piped_stdin_without_eof(stdout):
+    sys.stdin = StringIO("PLACE 0,0,NORTH\nRIGHT\nMOVE\nREPORT\n")
+    with mock.patch("toy_robot.cli.STDIN_CHUNK_SIZE", 8):
+        play(Robot(Navigator(Table())))
+    assert stdout.getvalue() == _BANNER + "Output: 1,0,EAST\n"
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_play_when_stdin_is_tty(stdout):
+    sys.stdin = _TtyStringIO("PLACE 0,0,NORTH\nJUMP\nREPORT\nEOF\n")
+    play(Robot(Navigator(Table())))
+    assert stdout.getvalue() == _BANNER + (
+        "Unsupported command of JUMP, supported commands: ['PLACE', 'GOTO', 'MOVE', 'LEFT', 'RIGHT', 'REPORT']\n"
+        "Please try a again.\n"
+        "Output: 0,0,NORTH\n"
+    )
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_main_automatic_mode(stdout):
+    main([_resource_file("commands_01.txt")])
+    assert stdout.getvalue() == "Output: 0,1,NORTH\n"
+
+
+@mock.patch("sys.stderr", new_callable=StringIO)
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_main_with_profile(stdout, stderr, tmp_path):
+    output_prefix = os.path.join(tmp_path, "run")
+    main([_resource_file("commands_01.txt"), "--profile", output_prefix, "--top", "3"])
+    assert stdout.getvalue() == "Output: 0,1,NORTH\n"
+    assert os.path.exists(f"{output_prefix}.pstats")
+    assert os.path.exists(f"{output_prefix}.collapsed")
+    assert stderr.getvalue().startswith("Time spent in each phase:\n  parsing")
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_main_automatic_mode_with_kernels(stdout):
+    main([_resource_file("commands_04.txt"), "--kernels"])
+    assert stdout.getvalue() == (
+        "This movement may endanger the robot, refuse to move\n" * 3
+        + "Output: 4,3,NORTH\n"
+    )
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_main_automatic_mode_with_many_files(stdout):
+    main([_resource_file("commands_01.txt"), _resource_file("commands_02.txt")])
+    assert stdout.getvalue() == "Output: 0,1,NORTH\nOutput: 0,0,WEST\n"
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_main_with_summary(stdout):
+    main(
+        [
+            _resource_file("commands_01.txt"),
+            _resource_file("commands_05.txt"),
+            "--summary",
+            "--workers",
+            "1",
+        ]
+    )
+    assert stdout.getvalue() == (
+        "Files: 2, failed: 0 (0.0%)\n"
+        "Reports: 1, refusals: 0, ignored: 2\n"
+        "Path length p50: 0.0, p90: 0.0, p99: 0.0\n"
+        "Final positions:\n"
+        "  0,1,NORTH: 1\n"
+        "  off the table: 1\n"
+    )
+
+
+@mock.patch("toy_robot.cli._play_file", wraps=_play_file)
+def test_automatic_mode_with_cache(play_file, tmp_path):
+    cache = ResultCache(os.path.join(tmp_path, "cache"))
+    outputs = []
+    for _ in range(2):
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            automatic_mode(_resource_file("commands_04.txt"), cache)
+        outputs.append(stdout.getvalue())
+
+    assert play_file.call_count == 1
+    assert (
+        outputs[0]
+        == outputs[1]
+        == (
+            "This movement may endanger the robot, refuse to move\n" * 3
+            + "Output: 4,3,NORTH\n"
+        )
+    )
+
+
+def test_automatic_mode_with_and_without_cache_when_lines_end_with_cr(tmp_path):
+    filepath = os.path.join(tmp_path, "commands.txt")
+    with open(filepath, "w", encoding="utf-8", newline="") as file:
+        file.write("PLACE 0,0,NORTH\rMOVE\r\nREPORT\rRIGHT\rMOVE\rREPORT\r")
+    outputs = []
+    for cache in (None, ResultCache(os.path.join(tmp_path, "cache"))):
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            automatic_mode(filepath, cache)
+        outputs.append(stdout.getvalue())
+
+    assert outputs[0] == outputs[1] == "Output: 0,1,NORTH\nOutput: 1,1,EAST\n"
@@ -1,8 +1,13 @@
+import sys
+import threading
+from itertools import count, islice
+
 import pytest
 
 from toy_robot.command_interpreter import (
     SimpleCommandsTranslatorFactory,
     PlaceCommandTranslator,
+    GotoCommandTranslator,
     CommandError,
 )
 from toy_robot.commands import (
@@ -11,6 +16,8 @@ from toy_robot.commands import (
     RightCommand,
     ReportCommand,
     PlaceCommand,
+    GotoCommand,
+    RepeatCommand,
 )
 from toy_robot.models import Position, Facing
 
@@ -80,6 +87,28 @@ class TestPlaceCommandTranslator:
         )
 
 
+class TestGotoCommandTranslator:
+    def test_translate_goto_command(self, robot):
+        cmd = GotoCommandTranslator.translate(robot, "3,1,west")
+        assert isinstance(cmd, GotoCommand) is True
+        assert cmd.position == Position(3, 1, Facing.WEST)
+
+    def test_translate_when_invalid_arguments(self, robot):
+        with pytest.raises(CommandError) as exc_info:
+            GotoCommandTranslator.translate(robot)
+        assert exc_info.value.args[0] == (
+            "Goto command must have args and args string should be the second "
+            "argument and separated by ',' such as 'GOTO 0,0,NORTH'"
+        )
+
+    def test_translate_goto_command_when_invalid_x(self, robot):
+        with pytest.raises(CommandError) as exc_info:
+            GotoCommandTranslator.translate(robot, "a,1,WEST")
+        assert (
+            exc_info.value.args[0] == "GOTO command x and y arguments must be integers"
+        )
+
+
 class TestCommandsInterpreter:
     def test_interpret_when_one_command(self, command_interpreter):
         commands = command_interpreter.interpret(["PLACE 0,0,EAST"])
@@ -110,7 +139,7 @@ class TestCommandsInterpreter:
         with pytest.raises(CommandError) as exc_info:
             command_interpreter.interpret(["JUMP", "1,2,SOUTH_EAST"])
         assert exc_info.value.args[0] == (
-            "Unsupported command of JUMP, supported commands: ['PLACE', 'MOVE', 'LEFT', 'RIGHT', 'REPORT']"
+            "Unsupported command of JUMP, supported commands: ['PLACE', 'GOTO', 'MOVE', 'LEFT', 'RIGHT', 'REPORT']"
         )
 
     def test_interpret_will_ignore_args_when_simple_command_has_args(
@@ -118,3 +147,235 @@ class TestCommandsInterpreter:
     ):
         move_command = command_interpreter.interpret(["MOVE 1,2,SOUTH_EAST"])
         assert isinstance(move_command[0], MoveCommand) is True
+
+    def test_interpret_should_share_commands_of_same_lines(self, command_interpreter):
+        commands = command_interpreter.interpret(
+            ["MOVE", "PLACE 1,2,EAST", "MOVE", "PLACE 1,2,EAST", "move"]
+        )
+        assert commands[0] is commands[2]
+        assert commands[1] is commands[3]
+        assert commands[4] is not commands[0]
+        assert isinstance(commands[4], MoveCommand) is True
+
+    def test_interpret_should_evict_least_recently_used_lines(
+        self, command_interpreter
+    ):
+        command_interpreter.max_shared_commands = 2
+        first, second = command_interpreter.interpret(["PLACE 0,0,EAST", "MOVE"])
+        assert command_interpreter.interpret(["PLACE 0,0,EAST"])[0] is first
+        command_interpreter.interpret(["LEFT"])
+        assert command_interpreter.interpret(["PLACE 0,0,EAST"])[0] is first
+        assert command_interpreter.interpret(["MOVE"])[0] is not second
+
+    def test_interpret_should_not_share_commands_after_registering_translator(
+        self, command_interpreter
+    ):
+        move_command = command_interpreter.interpret(["MOVE"])[0]
+        command_interpreter.register_translators(PlaceCommandTranslator)
+        assert command_interpreter.interpret(["MOVE"])[0] is not move_command
+
+    @pytest.mark.parametrize(
+        "line, position",
+        [
+            ("PLACE 1,2,EAST", Position(1, 2, Facing.EAST)),
+            (" place 3,0,north \n", Position(3, 0, Facing.NORTH)),
+            ("PLACE +1,-0,South\r\n", Position(1, 0, Facing.SOUTH)),
+            ("Place 10,20,WEST", Position(10, 20, Facing.WEST)),
+        ],
+    )
+    def test_interpret_place_lines_like_place_translator(
+        self, command_interpreter, robot, line, position
+    ):
+        command = command_interpreter.interpret([line])[0]
+        expected = PlaceCommandTranslator.translate(robot, line.strip().split(" ")[1])
+        assert isinstance(command, PlaceCommand) is True
+        assert command.position == expected.position == position
+
+    @pytest.mark.parametrize(
+        "line",
+        ["PLACE 1, 2,EAST", "PLACE  1,2,EAST", "PLACE 1,2,UP", "PLACE 1.5,2,EAST"],
+    )
+    def test_interpret_when_invalid_place_lines(self, command_interpreter, line):
+        with pytest.raises(CommandError):
+            command_interpreter.interpret([line])
+
+    def test_interpret_place_lines_with_registered_place_translator(
+        self, command_interpreter
+    ):
+        class MirroredPlaceCommandTranslator(PlaceCommandTranslator):
+            @classmethod
+            def translate(cls, robot, *args):
+                command = super().translate(robot, *args)
+                command.position.x, command.position.y = (
+                    command.position.y,
+                    command.position.x,
+                )
+                return command
+
+        command_interpreter.register_translators(MirroredPlaceCommandTranslator)
+        command = command_interpreter.interpret(["PLACE 1,2,EAST"])[0]
+        assert command.position == Position(2, 1, Facing.EAST)
+
+
+class TestCommandsInterpreterIterInterpret:
+    def test_iter_interpret_is_lazy(self, command_interpreter):
+        endless_commands = (f"PLACE {i % 5},0,NORTH" for i in count())
+        commands = list(islice(command_interpreter.iter_interpret(endless_commands), 7))
+        assert len(commands) == 7
+        assert commands[6].position == Position(1, 0, Facing.NORTH)
+
+    def test_iter_interpret_with_chained_stages(self, command_interpreter):
+        lines = iter(["# comment", "PLACE 0,0,EAST", "", "move", "MOVE", "report"])
+        without_comments = (line for line in lines if not line.startswith("#"))
+        commands = command_interpreter.iter_interpret(without_comments)
+        moves_only = [
+            command for command in commands if not isinstance(command, PlaceCommand)
+        ]
+        assert [type(command) for command in moves_only] == [
+            MoveCommand,
+            MoveCommand,
+            ReportCommand,
+        ]
+
+    def test_iter_interpret_raises_when_reaching_invalid_command(
+        self, command_interpreter
+    ):
+        commands = command_interpreter.iter_interpret(["MOVE", "JUMP"])
+        assert isinstance(next(commands), MoveCommand) is True
+        with pytest.raises(CommandError):
+            next(commands)
+
+
+class TestCommandsInterpreterMacros:
+    def test_interpret_repeat_command(self, command_interpreter):
+        commands = command_interpreter.interpret(["REPEAT 1000000000 MOVE,left"])
+        assert len(commands) == 1
+        assert isinstance(commands[0], RepeatCommand) is True
+        assert commands[0].count == 1000000000
+        assert isinstance(commands[0].commands[0], MoveCommand) is True
+        assert isinstance(commands[0].commands[1], LeftCommand) is True
+
+    def test_interpret_nested_repeat_command(self, command_interpreter):
+        commands = command_interpreter.interpret(["REPEAT 4 (REPEAT 3 MOVE),RIGHT"])
+        repeat = commands[0]
+        assert repeat.count == 4
+        assert len(repeat.commands) == 2
+        assert repeat.commands[0].count == 3
+        assert isinstance(repeat.commands[1], RightCommand) is True
+
+    def test_interpret_repeat_command_takes_all_commands_after_it(
+        self, command_interpreter
+    ):
+        commands = command_interpreter.interpret(["REPEAT 2 LEFT,REPEAT 3 MOVE,RIGHT"])
+        inner = commands[0].commands[1]
+        assert inner.count == 3
+        assert len(inner.commands) == 2
+
+    def test_interpret_repeat_command_is_shared(self, command_interpreter):
+        commands = command_interpreter.interpret(["REPEAT 2 MOVE", "REPEAT 2 MOVE"])
+        assert commands[0] is commands[1]
+
+    @pytest.mark.parametrize(
+        "command_text",
+        ["REPEAT", "REPEAT 3", "REPEAT -1 MOVE", "REPEAT x MOVE", "REPEAT 3 ,"],
+    )
+    def test_interpret_when_invalid_repeat_command(
+        self, command_interpreter, command_text
+    ):
+        with pytest.raises(CommandError) as exc_info:
+            command_interpreter.interpret([command_text])
+        assert exc_info.value.args[0] == (
+            "REPEAT command should have a non-negative count and comma separated commands, "
+            "such as 'REPEAT 3 MOVE,LEFT'"
+        )
+
+    @pytest.mark.parametrize(
+        "command_text, command_types",
+        [
+            ("REPEAT 2 PLACE 0,0,NORTH", [PlaceCommand]),
+            ("REPEAT 2 (PLACE 0,0,NORTH)", [PlaceCommand]),
+            (
+                "REPEAT 2 MOVE,PLACE 0,0,NORTH,LEFT",
+                [MoveCommand, PlaceCommand, LeftCommand],
+            ),
+            (
+                "REPEAT 2 (GOTO 1,2,EAST),place 0,0,NORTH , left",
+                [GotoCommand, PlaceCommand, LeftCommand],
+            ),
+        ],
+    )
+    def test_interpret_repeat_command_with_position_commands(
+        self, command_interpreter, command_text, command_types
+    ):
+        commands = command_interpreter.interpret([command_text])[0].commands
+        assert [type(command) for command in commands] == command_types
+        place = next(c for c in commands if isinstance(c, PlaceCommand))
+        assert place.position == Position(0, 0, Facing.NORTH)
+
+    def test_interpret_when_parentheses_not_balanced(self, command_interpreter):
+        with pytest.raises(CommandError) as exc_info:
+            command_interpreter.interpret(["REPEAT 2 (MOVE,LEFT"])
+        assert exc_info.value.args[0] == (
+            "Parentheses are not balanced in '(MOVE,LEFT'"
+        )
+
+    def test_interpret_macro(self, command_interpreter):
+        command_interpreter.register_macro("square", "REPEAT 4 (REPEAT {0} MOVE),RIGHT")
+        command_interpreter.register_macro("zigzag", "MOVE,LEFT,MOVE,RIGHT")
+        commands = command_interpreter.interpret(["SQUARE 3", "zigzag"])
+        assert commands[0].count == 4
+        assert commands[0].commands[0].count == 3
+        assert commands[1].count == 1
+        assert len(commands[1].commands) == 4
+
+    def test_interpret_macro_with_position_commands(self, command_interpreter):
+        command_interpreter.register_macro("HOME", "PLACE 0,0,NORTH")
+        command_interpreter.register_macro("VISIT", "GOTO {0},{1},EAST,HOME")
+        home, visit = command_interpreter.interpret(["HOME", "VISIT 3 4"])
+        assert isinstance(home, PlaceCommand)
+        assert home.position == Position(0, 0, Facing.NORTH)
+        goto, place = visit.commands
+        assert isinstance(goto, GotoCommand)
+        assert goto.position == Position(3, 4, Facing.EAST)
+        assert isinstance(place, PlaceCommand)
+
+    def test_interpret_macro_from_many_threads(self, command_interpreter):
+        command_interpreter.register_macro("SQ", "REPEAT 4 (REPEAT {0} MOVE),RIGHT")
+        errors = []
+
+        def interpret(offset: int):
+            try:
+                for i in range(offset, 2000, 4):
+                    command_interpreter.interpret([f"SQ {i}"])
+            except CommandError as e:
+                errors.append(e)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=interpret, args=(i,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert not errors
+
+    def test_interpret_when_macro_has_not_enough_args(self, command_interpreter):
+        command_interpreter.register_macro("SQUARE", "REPEAT 4 (REPEAT {0} MOVE),RIGHT")
+        with pytest.raises(CommandError) as exc_info:
+            command_interpreter.interpret(["SQUARE"])
+        assert exc_info.value.args[0] == (
+            "Macro SQUARE has not enough args for 'REPEAT 4 (REPEAT {0} MOVE),RIGHT'"
+        )
+
+    def test_interpret_when_macro_expands_into_itself(self, command_interpreter):
+        command_interpreter.register_macro("LOOP", "MOVE,LOOP")
+        with pytest.raises(CommandError) as exc_info:
+            command_interpreter.interpret(["LOOP"])
+        assert exc_info.value.args[0] == "Macro LOOP should not expand into itself"
+
+    def test_register_macro_when_replacing_command(self, command_interpreter):
+        with pytest.raises(ValueError):
+            command_interpreter.register_macro("move", "LEFT")
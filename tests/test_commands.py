@@ -6,6 +6,8 @@ from toy_robot.commands import (
     LeftCommand,
     RightCommand,
     ReportCommand,
+    RepeatCommand,
+    GotoCommand,
 )
 from toy_robot.models import Facing, Position
 from toy_robot.robot import Robot
@@ -44,3 +46,23 @@ def test_report_command(robot):
         report_command = ReportCommand(robot)
         report_command.execute()
         mocked_report.assert_called_once()
+
+
+def test_goto_command(robot):
+    with mock.patch.object(Robot, "goto") as mocked_goto:
+        goto_command = GotoCommand(robot, 3, 2, Facing.WEST)
+        goto_command.execute()
+        mocked_goto.assert_called_with(Position(3, 2, Facing.WEST))
+
+
+def test_repeat_command(robot):
+    with (
+        mock.patch.object(Robot, "move_forward") as mocked_move_forward,
+        mock.patch.object(Robot, "turn_left") as mocked_turn_left,
+    ):
+        repeat_command = RepeatCommand(
+            robot, 3, [MoveCommand(robot), LeftCommand(robot)]
+        )
+        repeat_command.execute()
+        assert mocked_move_forward.call_count == 3
+        assert mocked_turn_left.call_count == 3
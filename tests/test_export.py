@@ -0,0 +1,75 @@
+import csv
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from toy_robot.export import (
+    CsvReportWriter,
+    NpyReportWriter,
+    ReportColumns,
+    ReportExporter,
+    export_reports,
+)
+from toy_robot.models import Facing, Position
+
+
+def test_report_columns():
+    reports = ReportColumns()
+    reports.append(1, 3, Position(2, 4, Facing.WEST))
+    assert len(reports) == 1
+    assert [list(column) for column in reports.columns()] == [[1], [3], [2], [4], [3]]
+
+    reports.clear()
+    assert len(reports) == 0
+
+
+def test_report_exporter_flushes_in_chunks():
+    writer = mock.Mock()
+    exporter = ReportExporter(writer, chunk_size=2)
+    for line in range(5):
+        exporter.record(0, line, Position(0, 0, Facing.NORTH))
+    assert writer.write.call_count == 2
+
+    exporter.close()
+    assert writer.write.call_count == 3
+    writer.close.assert_called_once()
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_export_reports_to_csv(stdout, tmp_path, write_file):
+    commands_filepaths = [
+        write_file(os.path.join(tmp_path, "a.txt"), "PLACE 0,0,NORTH\nMOVE\nREPORT\n"),
+        write_file(os.path.join(tmp_path, "b.txt"), "REPORT\nJUMP\n"),
+        write_file(
+            os.path.join(tmp_path, "c.txt"), "PLACE 1,2,EAST\n\nREPORT\nLEFT\nREPORT\n"
+        ),
+    ]
+    csv_filepath = os.path.join(tmp_path, "reports.csv")
+    with ReportExporter(CsvReportWriter(csv_filepath), chunk_size=2) as exporter:
+        export_reports(commands_filepaths, exporter)
+
+    with open(csv_filepath, "r", encoding="utf-8") as file:
+        assert list(csv.reader(file)) == [
+            ["file_id", "line", "x", "y", "facing"],
+            ["0", "3", "0", "1", "0"],
+            ["2", "3", "1", "2", "1"],
+            ["2", "5", "1", "2", "0"],
+        ]
+    assert stdout.getvalue() == (
+        "Unsupported command of JUMP, supported commands: "
+        "['PLACE', 'GOTO', 'MOVE', 'LEFT', 'RIGHT', 'REPORT']\n"
+        "Please try a again.\n"
+    )
+
+
+def test_npy_report_writer(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    directory = os.path.join(tmp_path, "reports")
+    with ReportExporter(NpyReportWriter(directory), chunk_size=2) as exporter:
+        for line in range(3):
+            exporter.record(7, line, Position(line, 1, Facing.SOUTH))
+
+    chunk = numpy.load(os.path.join(directory, "reports-000001.npy"))
+    assert chunk.tolist() == [(7, 2, 2, 1, 2)]
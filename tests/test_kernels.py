@@ -0,0 +1,113 @@
+import os
+import random
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from toy_robot.kernels import KernelRobot, Kernel, execute_commands, kernel_for
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.robot import Robot
+from toy_robot.two_phase import run_file
+
+
+def _random_commands(rand: random.Random, count: int):
+    commands = []
+    for _ in range(count):
+        if rand.random() < 0.1:
+            x, y = rand.randint(-1, 6), rand.randint(-1, 6)
+            commands.append(f"PLACE {x},{y},{rand.choice(list(Facing)).name}")
+        else:
+            commands.append(
+                rand.choice(
+                    ["MOVE", "MOVE", "LEFT", "RIGHT", "REPORT", "REPEAT 2 MOVE"]
+                )
+            )
+    return commands
+
+
+def _play(robot: Robot, commands, execute) -> str:
+    with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+        try:
+            execute(robot, robot.command_interpreter.interpret(commands))
+        except ValueError as e:
+            print(e.args[0])
+        return stdout.getvalue()
+
+
+def _execute_one_by_one(robot, commands):
+    for command in commands:
+        command.execute()
+
+
+class TestKernel:
+    def test_precomputed_and_arithmetic_kernels_are_the_same(self):
+        precomputed = Kernel(Table(4, 3))
+        arithmetic = Kernel(Table(4, 3), max_states=0)
+        assert precomputed.precomputed is True
+        assert arithmetic.precomputed is False
+        for state in range(4 * 3 * 4):
+            assert precomputed.moves[state] == arithmetic.moves[state]
+            assert precomputed.lefts[state] == arithmetic.lefts[state]
+            assert precomputed.rights[state] == arithmetic.rights[state]
+
+    def test_encode_and_decode(self):
+        kernel = kernel_for(5, 5)
+        position = Position(3, 2, Facing.WEST)
+        assert kernel.encode(position) == (2 * 5 + 3) * 4 + 3
+        assert kernel.decode(kernel.encode(position)) == position
+        assert kernel.encode(None) == -1
+        assert kernel.decode(-1) is None
+
+    def test_move_is_refused_at_the_edge(self):
+        kernel = kernel_for(5, 5)
+        state = kernel.encode(Position(4, 0, Facing.EAST))
+        assert kernel.moves[state] == state
+        state = kernel.encode(Position(4, 0, Facing.NORTH))
+        assert kernel.decode(kernel.moves[state]) == Position(4, 1, Facing.NORTH)
+
+
+@pytest.mark.parametrize("max_states", [0, 1 << 20])
+def test_execute_commands_same_as_executing_one_by_one(max_states):
+    rand = random.Random(max_states)
+    for _ in range(50):
+        commands = _random_commands(rand, 40)
+        expected_robot = Robot(Navigator(Table()))
+        expected = _play(expected_robot, commands, _execute_one_by_one)
+
+        robot = Robot(Navigator(Table()))
+        actual = _play(
+            robot,
+            commands,
+            lambda robot, cmds: execute_commands(robot, cmds, max_states),
+        )
+        assert actual == expected
+        assert robot.current_position == expected_robot.current_position
+
+
+def test_kernel_robot_await_orders_same_as_robot():
+    rand = random.Random(1)
+    for _ in range(50):
+        commands = _random_commands(rand, 40) + ["GOTO 0,0,SOUTH", "REPORT"]
+        robots = [Robot(Navigator(Table())), KernelRobot(Navigator(Table()))]
+        outputs = [
+            _play(robot, commands, lambda robot, _: robot.await_orders(commands))
+            for robot in robots
+        ]
+        assert outputs[0] == outputs[1]
+        assert robots[0].current_position == robots[1].current_position
+
+
+def test_run_file_with_kernel_robot_same_as_robot(tmp_path):
+    rand = random.Random(2)
+    filepath = os.path.join(tmp_path, "commands.txt")
+    for _ in range(20):
+        with open(filepath, "w", encoding="utf-8") as file:
+            file.write("\n".join(_random_commands(rand, 40) + ["GOTO 0,0,SOUTH"]))
+        robots = [Robot(Navigator(Table())), KernelRobot(Navigator(Table()))]
+        outputs = [
+            _play(robot, [], lambda robot, _: run_file(robot, filepath))
+            for robot in robots
+        ]
+        assert outputs[0] == outputs[1]
+        assert robots[0].current_position == robots[1].current_position
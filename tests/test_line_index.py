@@ -0,0 +1,152 @@
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from toy_robot.command_interpreter import CommandError
+from toy_robot.line_index import (
+    INDEX_SUFFIX,
+    build_index,
+    load_index,
+    run_lines,
+    write_index,
+)
+from toy_robot.models import Navigator, Table
+from toy_robot.robot import Robot
+
+COMMANDS = (
+    "MOVE\n"
+    "PLACE 0,0,NORTH\n"
+    "MOVE\n"
+    "REPORT\n"
+    "PLACE 9,9,EAST\n"
+    "RIGHT\n"
+    "PLACE 2,2,SOUTH\n"
+    "MOVE\n"
+    "REPORT\n"
+)
+
+
+@pytest.fixture
+def commands_file(tmp_path) -> str:
+    filepath = os.path.join(tmp_path, "commands.txt")
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write(COMMANDS)
+    return filepath
+
+
+def test_build_index(commands_file):
+    index = build_index(commands_file)
+    assert index.line_count == 9
+    assert index.file_size == len(COMMANDS)
+    assert index.place_lines == [2, 7]
+    assert index.place_offsets == [5, COMMANDS.index("PLACE 2,2")]
+    assert index.checkpoint_offsets == [0]
+
+
+def test_build_index_when_invalid_line(tmp_path):
+    filepath = os.path.join(tmp_path, "commands.txt")
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write("PLACE 0,0,NORTH\nJUMP\n")
+    with pytest.raises(CommandError) as exc_info:
+        build_index(filepath)
+    assert exc_info.value.args[0].startswith("Line 2: Unsupported command of JUMP")
+
+
+def test_write_and_load_index(commands_file):
+    index = write_index(commands_file)
+    assert os.path.exists(commands_file + INDEX_SUFFIX)
+    assert load_index(commands_file) == index
+
+
+def test_load_index_when_file_changed(commands_file):
+    write_index(commands_file)
+    with open(commands_file, "a", encoding="utf-8") as file:
+        file.write("MOVE\n")
+    with pytest.raises(ValueError):
+        load_index(commands_file)
+
+
+def test_load_index_when_file_changed_in_the_same_size(commands_file):
+    write_index(commands_file)
+    stat = os.stat(commands_file)
+    with open(commands_file, "w", encoding="utf-8") as file:
+        file.write(COMMANDS.replace("NORTH", "SOUTH"))
+    os.utime(commands_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with pytest.raises(ValueError):
+        load_index(commands_file)
+
+
+@mock.patch("toy_robot.line_index.CHECKPOINT_INTERVAL", 1)
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_run_lines_uses_the_checkpoint_interval_of_the_index(stdout, tmp_path):
+    filepath = os.path.join(tmp_path, "commands.txt")
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write("MOVE\nLEFT\nREPORT\nPLACE 0,0,NORTH\n")
+    write_index(filepath, checkpoint_interval=2)
+    index = load_index(filepath)
+    assert (index.checkpoint_interval, index.checkpoint_offsets) == (2, [0, 10])
+
+    run_lines(Robot(Navigator(Table())), filepath, 3, 3, index)
+    assert stdout.getvalue() == (
+        "Please use PLACE command to put the robot on the table first, then you can order the robot to move\n"
+    )
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_run_lines_should_replay_from_nearest_place(stdout, commands_file):
+    write_index(commands_file)
+    robot = Robot(Navigator(Table()))
+    run_lines(robot, commands_file, 3, 4)
+    assert stdout.getvalue() == "Output: 0,1,NORTH\n"
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_run_lines_when_no_place_before_first_line(stdout, commands_file):
+    robot = Robot(Navigator(Table()))
+    index = build_index(commands_file, checkpoint_interval=1)
+    run_lines(robot, commands_file, 1, 1, index)
+    assert stdout.getvalue() == (
+        "Please use PLACE command to put the robot on the table first, then you can order the robot to move\n"
+    )
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_run_lines_at_a_place_line(stdout, commands_file):
+    index = build_index(commands_file)
+    robot = Robot(Navigator(Table()))
+    run_lines(robot, commands_file, 7, 9, index)
+    assert stdout.getvalue() == "Output: 2,1,SOUTH\n"
+
+
+def test_run_lines_when_out_of_range(commands_file):
+    index = build_index(commands_file)
+    with pytest.raises(ValueError):
+        run_lines(Robot(Navigator(Table())), commands_file, 5, 10, index)
+
+
+def test_run_lines_when_table_size_differs(commands_file):
+    index = build_index(commands_file)
+    with pytest.raises(ValueError):
+        run_lines(Robot(Navigator(Table(10, 10))), commands_file, 1, 2, index)
+
+
+@pytest.mark.parametrize("newline", ["\r\n", "\r"])
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_run_lines_when_lines_end_with_cr(stdout, tmp_path, newline):
+    filepath = os.path.join(tmp_path, "commands.txt")
+    text = COMMANDS.replace("\n", newline)
+    with open(filepath, "w", encoding="utf-8", newline="") as file:
+        file.write(text)
+    index = build_index(filepath, checkpoint_interval=2)
+    assert index.line_count == 9
+    assert index.place_offsets == [text.index("PLACE 0,0"), text.index("PLACE 2,2")]
+    assert index.checkpoint_offsets[:2] == [
+        0,
+        text.index("PLACE 0,0") + 15 + len(newline),
+    ]
+
+    run_lines(Robot(Navigator(Table())), filepath, 3, 4, index)
+    run_lines(Robot(Navigator(Table())), filepath, 7, 9, index)
+    assert stdout.getvalue() == "Output: 0,1,NORTH\nOutput: 2,1,SOUTH\n"
@@ -0,0 +1,107 @@
+import random
+from unittest import TestCase, mock
+
+from toy_robot import planner
+from toy_robot.models import Facing, Position, Table
+from toy_robot.planner import (
+    DISTANCE_FIELDS,
+    DistanceFieldCache,
+    plan_route,
+    _plan_directly,
+)
+
+
+def _walk(table: Table, start: Position, route) -> Position:
+    x, y, facing = start.x, start.y, start.facing
+    for command in route:
+        if command == "MOVE":
+            x, y = {
+                Facing.NORTH: (x, y + 1),
+                Facing.EAST: (x + 1, y),
+                Facing.SOUTH: (x, y - 1),
+                Facing.WEST: (x - 1, y),
+            }[facing]
+            assert 0 <= x <= table.max_x and 0 <= y <= table.max_y
+        elif command == "LEFT":
+            facing = facing.left()
+        else:
+            facing = facing.right()
+    return Position(x, y, facing)
+
+
+class TestPlanRoute(TestCase):
+    def setUp(self) -> None:
+        self.table = Table(5, 5)
+
+    def test_plan_route_when_already_at_target(self):
+        position = Position(2, 2, Facing.EAST)
+        assert plan_route(self.table, position, position) == []
+
+    def test_plan_route_when_straight_ahead(self):
+        route = plan_route(
+            self.table, Position(0, 0, Facing.NORTH), Position(0, 4, Facing.NORTH)
+        )
+        assert route == ["MOVE"] * 4
+
+    def test_plan_route_when_turning_back(self):
+        route = plan_route(
+            self.table, Position(1, 1, Facing.NORTH), Position(1, 1, Facing.SOUTH)
+        )
+        assert len(route) == 2
+        assert route[0] == route[1]
+
+    def test_plan_route_is_shortest(self):
+        start, target = Position(0, 0, Facing.SOUTH), Position(3, 2, Facing.WEST)
+        route = plan_route(self.table, start, target)
+        # 5 moves, a turn to face east or north, a turn between them and a turn to face west
+        assert len(route) == 8
+        assert route.count("MOVE") == 5
+
+        assert _walk(self.table, start, route) == target
+
+    def test_distance_field_is_cached(self):
+        DISTANCE_FIELDS.clear()
+        target = Position(4, 4, Facing.NORTH)
+        with mock.patch(
+            "toy_robot.planner._build_distance_field",
+            wraps=planner._build_distance_field,
+        ) as build:
+            plan_route(self.table, Position(0, 0, Facing.NORTH), target)
+            plan_route(self.table, Position(1, 0, Facing.EAST), target)
+        assert build.call_count == 1
+
+    def test_plan_directly_is_as_short_as_distance_field(self):
+        rand = random.Random(0)
+        for _ in range(200):
+            table = Table(rand.randint(1, 6), rand.randint(1, 6))
+            start, target = [
+                Position(
+                    rand.randint(0, table.max_x),
+                    rand.randint(0, table.max_y),
+                    rand.choice(list(Facing)),
+                )
+                for _ in range(2)
+            ]
+            route = _plan_directly(start, target)
+            assert len(route) == len(plan_route(table, start, target))
+            assert _walk(table, start, route) == target
+
+    @mock.patch("toy_robot.planner.DISTANCE_FIELD_MAX_STATES", 99)
+    def test_plan_route_directly_when_table_is_large(self):
+        DISTANCE_FIELDS.clear()
+        start, target = Position(0, 0, Facing.SOUTH), Position(3, 2, Facing.WEST)
+        route = plan_route(self.table, start, target)
+        assert len(route) == 8
+        assert _walk(self.table, start, route) == target
+        assert not DISTANCE_FIELDS.fields
+
+
+def test_distance_field_cache_evicts_by_states():
+    cache = DistanceFieldCache(max_states=250)
+    for target in (0, 1, 2):
+        cache.get(5, 5, target)
+    cache.get(5, 5, 0)
+    cache.get(5, 5, 3)
+
+    assert list(cache.fields) == [(5, 5, 0), (5, 5, 3)]
+    assert cache.states == 200
@@ -0,0 +1,89 @@
+import sys
+import threading
+from io import StringIO
+from unittest import TestCase, mock
+
+import pytest
+
+from toy_robot.command_interpreter import CommandError
+from toy_robot.pool import RobotPool
+
+
+class TestRobotPool(TestCase):
+    def setUp(self) -> None:
+        self.pool = RobotPool(max_idle=2)
+
+    def test_acquire_when_pool_is_empty(self):
+        robot = self.pool.acquire(3, 4)
+        assert robot.current_position is None
+        assert robot.navigator.table.max_x == 2
+        assert robot.navigator.table.max_y == 3
+
+    def test_release_should_reset_robot_for_reuse(self):
+        robot = self.pool.acquire()
+        robot.await_orders(["PLACE 1,2,EAST"])
+        self.pool.release(robot)
+
+        reused = self.pool.acquire()
+        assert reused is robot
+        assert reused.current_position is None
+
+    def test_release_should_restore_command_interpreter(self):
+        robot = self.pool.acquire()
+        robot.command_interpreter.register_macro("HOME", "PLACE 0,0,NORTH")
+        robot.command_interpreter.memory_budget = 10
+        robot.await_orders(["HOME"])
+        self.pool.release(robot)
+
+        reused = self.pool.acquire()
+        assert reused is robot
+        assert reused.command_interpreter.memory_budget is None
+        with pytest.raises(CommandError):
+            reused.await_orders(["HOME"])
+
+    def test_robots_are_keyed_by_table_size(self):
+        robot = self.pool.acquire(3, 3)
+        self.pool.release(robot)
+        assert self.pool.acquire(5, 5) is not robot
+        assert self.pool.acquire(3, 3) is robot
+
+    def test_prefill_and_max_idle(self):
+        self.pool.prefill(5)
+        assert self.pool.idle_count() == 2
+
+        robots = [self.pool.acquire() for _ in range(3)]
+        for robot in robots:
+            self.pool.release(robot)
+        assert self.pool.idle_count() == 2
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_robot_context_manager(self, stdout):
+        with self.pool.robot() as robot:
+            robot.await_orders(["PLACE 0,0,NORTH", "MOVE", "REPORT"])
+        assert stdout.getvalue() == "Output: 0,1,NORTH\n"
+        assert robot.current_position is None
+        assert self.pool.idle_count() == 1
+
+    def test_acquire_and_release_from_many_threads(self):
+        pool = RobotPool(max_idle=1)
+        errors = []
+
+        def borrow():
+            try:
+                for _ in range(200):
+                    pool.release(pool.acquire())
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=borrow) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert errors == []
+        assert pool.idle_count() == 1
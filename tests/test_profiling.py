@@ -0,0 +1,46 @@
+import os
+import threading
+import time
+
+from toy_robot.profiling import StackSampler, phase_of
+
+
+def test_phase_of():
+    assert phase_of("~", "<built-in method builtins.print>") == "printing"
+    assert phase_of("/src/toy_robot/command_interpreter.py", "translate") == (
+        "translation"
+    )
+    assert phase_of("/src/toy_robot/command_interpreter.py", "interpret") == "parsing"
+    assert phase_of("/src/toy_robot/models.py", "front") == "state updates"
+    assert phase_of("/src/toy_robot/robot.py", "move_forward") == "state updates"
+    assert phase_of("/src/toy_robot/kernels.py", "execute_commands") == (
+        "state updates"
+    )
+    assert phase_of("/src/toy_robot/spool.py", "_encode") == "parsing"
+    assert phase_of("/src/toy_robot/spool.py", "__iter__") == "parsing"
+    assert phase_of("/src/toy_robot/two_phase.py", "iter_lines") == "parsing"
+    assert phase_of("/src/toy_robot/two_phase.py", "_prepare") == "parsing"
+    assert phase_of("/src/toy_robot/two_phase.py", "place") == "translation"
+    assert phase_of("/src/toy_robot/two_phase.py", "<lambda>") == "state updates"
+    assert phase_of("/lib/json/decoder.py", "decode") == "other"
+
+
+def _busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_stack_sampler(tmp_path):
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    _busy_wait(0.05)
+    sampler.stop()
+
+    assert any("_busy_wait" in stack for stack in sampler.stacks)
+    filepath = os.path.join(tmp_path, "run.collapsed")
+    sampler.write_collapsed(filepath)
+    with open(filepath, "r", encoding="utf-8") as file:
+        stack, count = file.readline().rsplit(" ", 1)
+    assert ";" in stack
+    assert int(count) > 0
@@ -0,0 +1,63 @@
+import os
+import struct
+import zlib
+from io import StringIO
+
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.render import (
+    FrameBuffer,
+    PngFrameWriter,
+    RenderingRobot,
+    TextFrameWriter,
+)
+
+
+def test_frame_buffer_redraws_dirty_cells():
+    frame = FrameBuffer(Table(3, 2))
+    frame.draw_robot(Position(0, 0, Facing.NORTH))
+    assert frame.take_dirty() == {0}
+
+    frame.draw_robot(Position(0, 1, Facing.EAST))
+    assert frame.take_dirty() == {0, 3}
+    assert frame.text() == ">..\n*.."
+
+    frame.draw_robot(None)
+    assert frame.take_dirty() == {3}
+    assert frame.text() == "*..\n*.."
+
+
+def test_rendering_robot_writes_every_n_steps():
+    stream = StringIO()
+    robot = RenderingRobot(Navigator(Table(3, 3)), TextFrameWriter(stream), every=2)
+    robot.await_orders(["PLACE 0,0,NORTH", "MOVE", "RIGHT", "GOTO 2,1,EAST"])
+    robot.flush()
+    assert stream.getvalue() == (
+        "Step 2\n...\n^..\n*..\n\n"
+        "Step 4\n...\n*>.\n*..\n\n"
+        "Step 5\n...\n**>\n*..\n\n"
+    )
+
+
+def test_png_frame_writer(tmp_path):
+    directory = os.path.join(tmp_path, "frames")
+    robot = RenderingRobot(
+        Navigator(Table(3, 2)), PngFrameWriter(directory, cell_pixels=2), every=2
+    )
+    robot.await_orders(["PLACE 0,0,EAST", "MOVE", "MOVE"])
+
+    assert sorted(os.listdir(directory)) == ["frame-000000002.png"]
+    robot.flush()
+    with open(os.path.join(directory, "frame-000000003.png"), "rb") as file:
+        png = file.read()
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert struct.unpack(">II", png[16:24]) == (6, 4)
+
+    idat = png.index(b"IDAT")
+    (length,) = struct.unpack(">I", png[idat - 4 : idat])
+    rows = zlib.decompress(png[idat + 4 : idat + 4 + length])
+    assert [rows[i * 7 + 1 : i * 7 + 7] for i in range(4)] == [
+        bytes(6),
+        bytes(6),
+        bytes([1, 1, 1, 1, 2, 2]),
+        bytes([1, 1, 1, 1, 2, 2]),
+    ]
@@ -0,0 +1,97 @@
+import os
+
+from toy_robot.replay import (
+    diff_logs,
+    diff_runs,
+    read_digest,
+    replay_archive,
+    replay_file,
+)
+
+
+def _read(filepath: str) -> str:
+    with open(filepath, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def test_replay_file(tmp_path, write_file):
+    commands_filepath = write_file(
+        os.path.join(tmp_path, "commands.txt"),
+        "REPORT\nPLACE 0,0,SOUTH\nMOVE\n\nLEFT\nREPORT\n",
+    )
+    log_filepath = os.path.join(tmp_path, "commands.log")
+    digest = replay_file(commands_filepath, log_filepath)
+
+    log = _read(log_filepath)
+    assert log.startswith(
+        "1\tPlease use PLACE command to put the robot on the table first, then you can order the robot to move\n"
+        "3\tThis movement may endanger the robot, refuse to move\n"
+        "6\tOutput: 0,0,EAST\n"
+        "6\tFinal: 0,0,EAST\n"
+    )
+    assert log.endswith(f"sha256\t{digest}\n")
+    assert read_digest(log_filepath) == digest
+
+
+def test_replay_file_when_invalid_command(tmp_path, write_file):
+    commands_filepath = write_file(
+        os.path.join(tmp_path, "commands.txt"), "PLACE 0,0,NORTH\nREPORT\nJUMP\nMOVE\n"
+    )
+    log_filepath = os.path.join(tmp_path, "commands.log")
+    replay_file(commands_filepath, log_filepath)
+    assert _read(log_filepath).startswith(
+        "3\tUnsupported command of JUMP, supported commands: ['PLACE', 'GOTO', 'MOVE', 'LEFT', 'RIGHT', 'REPORT']\n"
+        "4\tFinal: None\n"
+    )
+
+
+def test_replay_file_when_placed_out_of_table(tmp_path, write_file):
+    commands_filepath = write_file(
+        os.path.join(tmp_path, "commands.txt"),
+        "PLACE 0,0,NORTH\nPLACE 7,0,NORTH\nREPORT\n",
+    )
+    log_filepath = os.path.join(tmp_path, "commands.log")
+    replay_file(commands_filepath, log_filepath)
+    assert _read(log_filepath).startswith(
+        "2\tPlease put the robot on the table, in case of damaging it. The table max x and y is 4, 4\n"
+        "3\tFinal: 0,0,NORTH\n"
+    )
+
+
+def test_diff_logs(tmp_path, write_file):
+    log_a = write_file(
+        os.path.join(tmp_path, "a.log"),
+        "1\tOutput: 0,0,NORTH\n3\tFinal: 0,0,NORTH\nsha256\taa\n",
+    )
+    log_b = write_file(
+        os.path.join(tmp_path, "b.log"),
+        "1\tOutput: 0,0,NORTH\n2\tOutput: 0,1,NORTH\nsha256\tbb\n",
+    )
+    log_c = write_file(
+        os.path.join(tmp_path, "c.log"),
+        "1\tOutput: 0,0,NORTH\n3\tFinal: 0,0,NORTH\nsha256\taa\n",
+    )
+    assert diff_logs(log_a, log_b) == 2
+    assert diff_logs(log_a, log_c) is None
+
+
+def test_replay_archive_and_diff_runs(tmp_path, write_file):
+    archive_dir = os.path.join(tmp_path, "archive")
+    write_file(os.path.join(archive_dir, "a.txt"), "PLACE 0,0,NORTH\nMOVE\nREPORT\n")
+    write_file(os.path.join(archive_dir, "nested", "b.txt"), "PLACE 1,1,EAST\nREPORT\n")
+    run_a, run_b = os.path.join(tmp_path, "run_a"), os.path.join(tmp_path, "run_b")
+
+    digests = replay_archive(archive_dir, run_a, workers=2)
+    assert sorted(digests) == ["a.txt", os.path.join("nested", "b.txt")]
+    replay_archive(archive_dir, run_b, workers=2)
+    assert diff_runs(run_a, run_b, workers=2) == {}
+
+    write_file(
+        os.path.join(archive_dir, "nested", "b.txt"), "PLACE 1,1,EAST\nMOVE\nREPORT\n"
+    )
+    write_file(os.path.join(archive_dir, "c.txt"), "MOVE\n")
+    replay_archive(archive_dir, run_b, workers=2)
+    assert diff_runs(run_a, run_b, workers=2) == {
+        os.path.join("nested", "b.txt.log"): 2,
+        "c.txt.log": 0,
+    }
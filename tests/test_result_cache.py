@@ -0,0 +1,88 @@
+import os
+import time
+from unittest import mock
+
+from toy_robot.models import Table
+from toy_robot.result_cache import (
+    CachedResult,
+    ResultCache,
+    cache_key,
+    file_cache_key,
+)
+
+
+def test_cache_key_depends_on_content_and_table_size():
+    content = b"PLACE 0,0,NORTH\nREPORT\n"
+    assert cache_key(content, Table()) == cache_key(content, Table(5, 5))
+    assert cache_key(content, Table()) != cache_key(content, Table(6, 6))
+    assert cache_key(content, Table()) != cache_key(content + b"MOVE\n", Table())
+
+
+def test_cache_key_depends_on_cache_version():
+    content = b"PLACE 0,0,NORTH\nREPORT\n"
+    key = cache_key(content, Table())
+    with mock.patch("toy_robot.result_cache.CACHE_VERSION", 2):
+        assert cache_key(content, Table()) != key
+
+
+@mock.patch("toy_robot.result_cache.HASH_CHUNK_SIZE", 4)
+def test_file_cache_key_is_the_same_as_cache_key_of_content(tmp_path):
+    content = b"PLACE 0,0,NORTH\r\nMOVE\rREPORT\n"
+    filepath = os.path.join(tmp_path, "commands.txt")
+    with open(filepath, "wb") as file:
+        file.write(content)
+    assert file_cache_key(filepath, Table()) == cache_key(content, Table())
+
+
+def test_result_cache_get_and_put(tmp_path):
+    cache = ResultCache(os.path.join(tmp_path, "cache"))
+    assert cache.get("a") is None
+
+    cache.put("a", CachedResult("Output: 0,0,NORTH\n", "0,0,NORTH"))
+    assert cache.get("a") == CachedResult("Output: 0,0,NORTH\n", "0,0,NORTH")
+    assert ResultCache(cache.directory).get("a") == cache.get("a")
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    result = CachedResult("x" * 100, None)
+    cache = ResultCache(str(tmp_path), max_bytes=450)
+    for key in ("a", "b", "c"):
+        cache.put(key, result)
+        time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.put("d", result)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) == result for key in ("a", "c", "d"))
+
+
+def test_result_cache_does_not_scan_the_directory_after_opened(tmp_path):
+    result = CachedResult("x" * 100, None)
+    cache = ResultCache(str(tmp_path), max_bytes=300)
+    with mock.patch("os.scandir") as scandir, mock.patch("os.stat") as stat:
+        for key in ("a", "b", "c"):
+            cache.put(key, result)
+        cache.get("b")
+        cache.put("d", result)
+    scandir.assert_not_called()
+    stat.assert_not_called()
+
+    assert list(cache.sizes) == ["b", "d"]
+    assert cache.total == sum(
+        os.path.getsize(os.path.join(tmp_path, f"{key}.json")) for key in ("b", "d")
+    )
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "d.json"]
+
+
+def test_result_cache_loads_the_order_of_the_entries_when_opened(tmp_path):
+    result = CachedResult("x" * 100, None)
+    cache = ResultCache(str(tmp_path))
+    for key in ("a", "b", "c"):
+        cache.put(key, result)
+        time.sleep(0.01)
+    cache.get("a")
+
+    cache = ResultCache(str(tmp_path), max_bytes=cache.total - 1)
+    assert list(cache.sizes) == ["c", "a"]
+    assert cache.get("b") is None
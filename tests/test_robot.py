@@ -1,8 +1,9 @@
+import threading
 from io import StringIO
 from unittest import TestCase, mock
 
 from toy_robot.models import Facing, Navigator, Table
-from toy_robot.robot import Robot, Position
+from toy_robot.robot import Robot, Position, ThreadSafeRobot
 
 
 class TestRobot(TestCase):
@@ -59,3 +60,82 @@ class TestRobot(TestCase):
         assert stdout.getvalue() == (
             "Please use PLACE command to put the robot on the table first, then you can order the robot to move\n"
         )
+
+    def test_await_orders_when_same_place_line_repeated(self):
+        self.robot.await_orders(["PLACE 1,2,EAST", "LEFT", "PLACE 1,2,EAST"])
+        assert self.robot.current_position == Position(1, 2, Facing.EAST)
+
+    def test_await_orders_with_macro(self):
+        self.robot.command_interpreter.register_macro(
+            "SQUARE", "REPEAT 4 (REPEAT {0} MOVE),RIGHT"
+        )
+        self.robot.await_orders(["PLACE 1,1,NORTH", "SQUARE 3", "REPEAT 3 MOVE"])
+        assert self.robot.current_position == Position(1, 4, Facing.NORTH)
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_goto(self, stdout):
+        self.robot.await_orders(["GOTO 3,2,WEST", "REPORT"])
+        assert self.robot.current_position == Position(3, 2, Facing.WEST)
+        assert stdout.getvalue() == "Output: 3,2,WEST\n"
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_goto_when_target_out_of_table(self, stdout):
+        self.robot.goto(Position(5, 0, Facing.NORTH))
+        assert self.robot.current_position == Position(0, 0, Facing.NORTH)
+        assert stdout.getvalue() == (
+            "This movement may endanger the robot, refuse to move\n"
+        )
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_goto_when_place_command_is_not_called_first(self, stdout):
+        robot = Robot(Navigator(Table()))
+        robot.goto(Position(1, 1, Facing.NORTH))
+        assert robot.current_position is None
+        assert stdout.getvalue() == (
+            "Please use PLACE command to put the robot on the table first, then you can order the robot to move\n"
+        )
+
+    def test_reset(self):
+        self.robot.reset()
+        assert self.robot.current_position is None
+
+
+class TestThreadSafeRobot(TestCase):
+    def setUp(self) -> None:
+        self.robot = ThreadSafeRobot(Navigator(Table()), Position(0, 0, Facing.NORTH))
+
+    def test_turn_should_replace_position(self):
+        position = self.robot.current_position
+        self.robot.turn_right()
+        assert position == Position(0, 0, Facing.NORTH)
+        assert self.robot.current_position == Position(0, 0, Facing.EAST)
+
+        self.robot.turn_left()
+        assert self.robot.current_position == Position(0, 0, Facing.NORTH)
+
+    @mock.patch("sys.stdout", new_callable=StringIO)
+    def test_turn_when_not_placed(self, stdout):
+        self.robot.reset()
+        self.robot.turn_left()
+        assert stdout.getvalue() == (
+            "Please use PLACE command to put the robot on the table first, then you can order the robot to move\n"
+        )
+
+    def test_await_orders(self):
+        self.robot.await_orders(["PLACE 1,1,EAST", "MOVE", "LEFT", "MOVE"])
+        assert self.robot.current_position == Position(2, 2, Facing.NORTH)
+
+    def test_concurrent_batches(self):
+        self.robot.set_position(Position(2, 2, Facing.NORTH))
+        square = ["MOVE", "RIGHT", "MOVE", "RIGHT", "MOVE", "RIGHT", "MOVE", "RIGHT"]
+
+        def worker():
+            for _ in range(100):
+                self.robot.await_orders(square)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert self.robot.current_position == Position(2, 2, Facing.NORTH)
@@ -0,0 +1,101 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from toy_robot.command_interpreter import CommandError
+from toy_robot.commands import (
+    GotoCommand,
+    LeftCommand,
+    MoveCommand,
+    PlaceCommand,
+    RepeatCommand,
+    ReportCommand,
+    RightCommand,
+)
+from toy_robot.models import Facing, Position
+
+COMMANDS = [
+    "PLACE 1,2,EAST",
+    "MOVE",
+    "",
+    "LEFT",
+    "RIGHT",
+    "REPEAT 2 MOVE,LEFT",
+    "GOTO 0,0,SOUTH",
+    "REPORT",
+]
+
+
+def _outputs(robot, commands):
+    robot.reset()
+    with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+        for command in commands:
+            command.execute()
+    return stdout.getvalue()
+
+
+def test_spool_within_memory_budget(command_interpreter):
+    with command_interpreter.spool(COMMANDS, memory_budget=1 << 20) as spool:
+        assert spool.file is None
+        assert len(spool) == len(spool.commands) == 7
+
+
+def test_spool_spills_over_memory_budget(robot, command_interpreter):
+    expected = _outputs(robot, command_interpreter.interpret(COMMANDS))
+    with command_interpreter.spool(COMMANDS, memory_budget=16) as spool:
+        assert len(spool.commands) == 2
+        assert spool.spilled == 5
+        commands = list(spool)
+        assert [type(command) for command in commands] == [
+            PlaceCommand,
+            MoveCommand,
+            LeftCommand,
+            RightCommand,
+            RepeatCommand,
+            GotoCommand,
+            ReportCommand,
+        ]
+        assert commands[5].position == Position(0, 0, Facing.SOUTH)
+        assert _outputs(robot, spool) == _outputs(robot, spool) == expected
+    assert spool.file is None
+
+
+def test_spool_spills_everything(robot, command_interpreter):
+    command_interpreter.memory_budget = 0
+    with command_interpreter.spool(COMMANDS) as spool:
+        assert (len(spool.commands), spool.spilled) == (0, 7)
+        place = next(iter(spool))
+        assert isinstance(place, PlaceCommand)
+        assert place.position == Position(1, 2, Facing.EAST)
+
+
+def test_spool_validates_all_commands(robot, command_interpreter):
+    with pytest.raises(CommandError):
+        command_interpreter.spool(COMMANDS + ["JUMP"], memory_budget=0)
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_await_orders_with_memory_budget(stdout, robot):
+    robot.command_interpreter.memory_budget = 0
+    robot.await_orders(["PLACE 0,0,NORTH", "MOVE", "REPORT"])
+    assert stdout.getvalue() == "Output: 0,1,NORTH\n"
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_await_orders_with_memory_budget_when_position_is_out_of_int32(stdout, robot):
+    robot.command_interpreter.memory_budget = 0
+    with pytest.raises(ValueError) as exc_info:
+        robot.await_orders(["PLACE 0,0,NORTH", "REPORT", "PLACE 99999999999,0,NORTH"])
+    assert exc_info.value.args[0].startswith("Please put the robot on the table")
+    assert stdout.getvalue() == "Output: 0,0,NORTH\n"
+
+
+def test_spool_spills_positions_out_of_int32(robot, command_interpreter):
+    commands = ["GOTO -2147483648,2147483647,EAST", "PLACE 2147483648,-2147483649,WEST"]
+    with command_interpreter.spool(commands, memory_budget=0) as spool:
+        assert spool.spilled == 2
+        assert [(type(command), command.position) for command in spool] == [
+            (GotoCommand, Position(-(2**31), 2**31 - 1, Facing.EAST)),
+            (PlaceCommand, Position(2**31, -(2**31) - 1, Facing.WEST)),
+        ]
@@ -0,0 +1,136 @@
+import mmap
+import os
+from io import StringIO
+from unittest import mock
+
+import pytest
+
+from toy_robot.command_interpreter import CommandTranslator
+from toy_robot.commands import LeftCommand
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.robot import Robot
+from toy_robot.two_phase import (
+    LineCommandError,
+    direct_orders,
+    iter_file_commands,
+    iter_lines,
+    run_file,
+)
+
+COMMANDS = (
+    "place 1,2,EAST\r\n"
+    "MOVE\n"
+    "\n"
+    "REPEAT 2 MOVE,LEFT\n"
+    "REPORT\n"
+    "GOTO 0,0,WEST\n"
+    "MOVE\n"
+    "REPORT"
+)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_run_file_is_the_same_as_await_orders(tmp_path, newline, write_file):
+    commands_filepath = write_file(
+        os.path.join(tmp_path, "commands.txt"), COMMANDS.replace("\n", newline)
+    )
+    robots = [Robot(Navigator(Table())) for _ in range(2)]
+    outputs = []
+    for robot in robots:
+        with mock.patch("sys.stdout", new_callable=StringIO) as stdout:
+            if robot is robots[0]:
+                run_file(robot, commands_filepath)
+            else:
+                with open(commands_filepath, "r", encoding="utf-8") as file:
+                    robot.await_orders(file.readlines())
+        outputs.append(stdout.getvalue())
+
+    assert (
+        outputs[0]
+        == outputs[1]
+        == (
+            "Output: 3,3,WEST\n"
+            "This movement may endanger the robot, refuse to move\n"
+            "Output: 0,0,WEST\n"
+        )
+    )
+    assert robots[0].current_position == Position(0, 0, Facing.WEST)
+
+
+@pytest.mark.parametrize(
+    "text", ["a\nb\n", "a\r\nb", "a\rb\r", "a\r\rb\r\n\nc", "\r\n\r"]
+)
+def test_iter_lines_is_the_same_as_readlines(tmp_path, text, write_file):
+    filepath = write_file(os.path.join(tmp_path, "lines.txt"), text)
+    with open(filepath, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            lines = list(iter_lines(buffer))
+    with open(filepath, "r", encoding="utf-8") as file:
+        assert lines == file.readlines()
+
+
+@mock.patch("sys.stdout", new_callable=StringIO)
+def test_run_file_executes_nothing_when_a_line_is_invalid(stdout, tmp_path, write_file):
+    commands_filepath = write_file(
+        os.path.join(tmp_path, "commands.txt"), COMMANDS + "\nJUMP\n"
+    )
+    robot = Robot(Navigator(Table()))
+    with pytest.raises(LineCommandError) as exc_info:
+        run_file(robot, commands_filepath)
+    assert exc_info.value.line_number == 9
+    assert exc_info.value.args[0].startswith("Unsupported command of JUMP")
+    assert stdout.getvalue() == ""
+    assert robot.current_position is None
+
+
+def test_run_file_when_file_is_empty(tmp_path, write_file):
+    robot = Robot(Navigator(Table()))
+    run_file(robot, write_file(os.path.join(tmp_path, "empty.txt"), ""))
+    assert robot.current_position is None
+
+
+def test_iter_file_commands(tmp_path, write_file):
+    commands_filepath = write_file(os.path.join(tmp_path, "commands.txt"), COMMANDS)
+    robot = Robot(Navigator(Table()))
+    numbered_commands = list(iter_file_commands(robot, commands_filepath))
+    assert [line_number for line_number, _ in numbered_commands] == [
+        1,
+        2,
+        4,
+        5,
+        6,
+        7,
+        8,
+    ]
+    assert numbered_commands[0][1].position == Position(1, 2, Facing.EAST)
+
+
+def test_iter_file_commands_validates_the_whole_file_first(tmp_path, write_file):
+    commands_filepath = write_file(
+        os.path.join(tmp_path, "commands.txt"), "PLACE 0,0,NORTH\nMOVE\nJUMP\n"
+    )
+    commands = iter_file_commands(Robot(Navigator(Table())), commands_filepath)
+    with pytest.raises(LineCommandError) as exc_info:
+        next(commands)
+    assert exc_info.value.line_number == 3
+
+
+def test_direct_orders_skip_replaced_translators(robot):
+    assert set(direct_orders(robot, robot.command_interpreter)) == {
+        "PLACE",
+        "GOTO",
+        "MOVE",
+        "LEFT",
+        "RIGHT",
+        "REPORT",
+    }
+
+    class MoveLeftTranslator(CommandTranslator):
+        command = "MOVE"
+
+        @classmethod
+        def translate(cls, robot, *args):
+            return LeftCommand(robot)
+
+    robot.command_interpreter.register_translators(MoveLeftTranslator)
+    assert "MOVE" not in direct_orders(robot, robot.command_interpreter)
@@ -0,0 +1,230 @@
+"""
+Aggregated statistics over the command files of a batch run. The statistics are kept in streaming accumulators which
+can be merged, every worker summarizes its own files and the summaries are merged at the end, so neither the files nor
+the per file results are held in memory
+"""
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Iterable, List, Optional
+
+from toy_robot.command_interpreter import CommandError
+from toy_robot.models import Navigator, Position, Table
+from toy_robot.robot import Robot
+from toy_robot.two_phase import run_file
+
+OFF_TABLE = "off the table"
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of non-negative values, the values are counted in logarithmic buckets, so that the quantiles
+    are within the relative accuracy, and two sketches with the same accuracy can be merged by adding up the buckets
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Counter = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """
+        Add a value
+        :param value: a non-negative value
+        :return: no return value
+        """
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merge another sketch into this one
+        :param other: a sketch with the same relative accuracy
+        :return: no return value
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only the sketches with the same accuracy can be merged")
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+        :param q: the quantile, between 0 and 1
+        :return: the estimated value, None if there is no value
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+@dataclass
+class BatchSummary:
+    """
+    Statistics of a batch run, the path length of a file is the number of the steps the robot moved
+    """
+
+    files: int = 0
+    failed_files: int = 0
+    reports: int = 0
+    refusals: int = 0
+    ignored: int = 0
+    final_positions: Counter = field(default_factory=Counter)
+    path_lengths: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def merge(self, other: "BatchSummary") -> "BatchSummary":
+        """
+        Merge another summary into this one
+        :param other: another summary
+        :return: this summary
+        """
+        self.files += other.files
+        self.failed_files += other.failed_files
+        self.reports += other.reports
+        self.refusals += other.refusals
+        self.ignored += other.ignored
+        self.final_positions.update(other.final_positions)
+        self.path_lengths.merge(other.path_lengths)
+        return self
+
+    def __str__(self) -> str:
+        error_rate = self.failed_files / self.files if self.files else 0
+        quantiles = ", ".join(
+            f"p{round(q * 100)}: {self.path_lengths.quantile(q) or 0:.1f}"
+            for q in (0.5, 0.9, 0.99)
+        )
+        lines = [
+            f"Files: {self.files}, failed: {self.failed_files} ({error_rate:.1%})",
+            f"Reports: {self.reports}, refusals: {self.refusals}, ignored: {self.ignored}",
+            f"Path length {quantiles}",
+            "Final positions:",
+        ]
+        lines += [
+            f"  {position}: {count}"
+            for position, count in self.final_positions.most_common()
+        ]
+        return "\n".join(lines)
+
+
+class _CountingRobot(Robot):
+    """
+    A robot which counts what happens instead of printing it
+    """
+
+    def __init__(self, navigator: Navigator):
+        super().__init__(navigator)
+        self.reports = self.refusals = self.ignored = self.moves = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.reports = self.refusals = self.ignored = self.moves = 0
+
+    def turn_left(self) -> None:
+        if self.current_position is None:
+            self.ignored += 1
+        else:
+            super().turn_left()
+
+    def turn_right(self) -> None:
+        if self.current_position is None:
+            self.ignored += 1
+        else:
+            super().turn_right()
+
+    def move_forward(self) -> None:
+        if self.current_position is None:
+            self.ignored += 1
+            return
+        position = self.current_position.front()
+        if self.navigator.safe(position):
+            self.current_position = position
+            self.moves += 1
+        else:
+            self.refusals += 1
+
+    def goto(self, position: Position) -> None:
+        if self.current_position is None:
+            self.ignored += 1
+        elif not self.navigator.safe(position):
+            self.refusals += 1
+        else:
+            super().goto(position)
+
+    def report(self) -> None:
+        if self.current_position is None:
+            self.ignored += 1
+        else:
+            self.reports += 1
+
+
+def summarize_files(
+    commands_filepaths: Iterable[str], width: int = 5, length: int = 5
+) -> BatchSummary:
+    """
+    Play the command files in the same way as the automatic mode and summarize them
+    :param commands_filepaths: the paths of the files which contain a bunch of commands
+    :param width: width of the table
+    :param length: length of the table
+    :return: BatchSummary
+    """
+    summary = BatchSummary()
+    robot = _CountingRobot(Navigator(Table(width, length)))
+    for commands_filepath in commands_filepaths:
+        robot.reset()
+        try:
+            run_file(robot, commands_filepath)
+        except (CommandError, ValueError):
+            summary.failed_files += 1
+        summary.files += 1
+        summary.reports += robot.reports
+        summary.refusals += robot.refusals
+        summary.ignored += robot.ignored
+        summary.final_positions[str(robot.current_position or OFF_TABLE)] += 1
+        summary.path_lengths.add(robot.moves)
+    return summary
+
+
+def summarize(
+    commands_filepaths: List[str],
+    width: int = 5,
+    length: int = 5,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> BatchSummary:
+    """
+    Summarize the command files in parallel, each worker summarizes a chunk of files and the summaries are merged
+    :param commands_filepaths: the paths of the files which contain a bunch of commands
+    :param width: width of the table
+    :param length: length of the table
+    :param workers: the number of worker processes, default is the number of CPUs
+    :param chunk_size: the number of files for a worker to summarize at a time
+    :return: BatchSummary
+    """
+    chunks = [
+        commands_filepaths[i : i + chunk_size]
+        for i in range(0, len(commands_filepaths), chunk_size)
+    ]
+    summary = BatchSummary()
+    with ProcessPoolExecutor(workers) as executor:
+        for chunk_summary in executor.map(
+            partial(summarize_files, width=width, length=length), chunks
+        ):
+            summary.merge(chunk_summary)
+    return summary
@@ -0,0 +1,47 @@
+"""
+Async command sources, they feed string typed commands to Robot.await_orders_async without blocking the event loop,
+so that one process can drive many robots at the same time
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Optional
+
+
+async def lines_from_stream(reader: asyncio.StreamReader) -> AsyncIterator[str]:
+    """
+    Read commands from a stream, such as a pipe or a socket
+    :param reader: the stream reader
+    :return: async iterator of string typed commands
+    """
+    while line := await reader.readline():
+        yield line.decode("utf-8")
+
+
+async def lines_from_queue(
+    queue: asyncio.Queue, sentinel: Any = None
+) -> AsyncIterator[str]:
+    """
+    Read commands from a queue until the sentinel is got
+    :param queue: the queue of string typed commands
+    :param sentinel: the item which marks the end of the commands
+    :return: async iterator of string typed commands
+    """
+    while (line := await queue.get()) is not sentinel:
+        yield line
+
+
+async def lines_from_file(
+    filepath: str, chunk_size: int = 1 << 16, executor: Optional[Executor] = None
+) -> AsyncIterator[str]:
+    """
+    Read commands from a file, the file is read in chunks in a thread pool
+    :param filepath: the path of the file which contains a bunch of commands
+    :param chunk_size: the approximate size in bytes of each chunk
+    :param executor: the executor to read the file, default is the default executor of the event loop
+    :return: async iterator of string typed commands
+    """
+    loop = asyncio.get_running_loop()
+    with open(filepath, "r", encoding="utf-8") as file:
+        while lines := await loop.run_in_executor(executor, file.readlines, chunk_size):
+            for line in lines:
+                yield line
@@ -1,12 +1,31 @@
 """
 Command line for toy robot game. There are two mode, one is interactive mode for player to input commands one by one,
-another is automatic mode which can let the robot load commands from a file
+another is automatic mode which can let the robot load commands from a file. The automatic mode can also play a batch
+of files and print a summary of them instead of the outputs
 """
+import argparse
+import io
 import sys
+from contextlib import redirect_stdout
+from functools import partial
+from typing import Callable, List, TextIO, Optional
 
+from toy_robot.aggregate import summarize
 from toy_robot.command_interpreter import CommandError
+from toy_robot.commands import Command
+from toy_robot.kernels import KernelRobot
 from toy_robot.models import Table, Navigator
+from toy_robot.profiling import profile
+from toy_robot.result_cache import (
+    DEFAULT_MAX_BYTES,
+    CachedResult,
+    ResultCache,
+    file_cache_key,
+)
 from toy_robot.robot import Robot
+from toy_robot.two_phase import run_file
+
+STDIN_CHUNK_SIZE = 1 << 20
 
 
 def initialize_table() -> Table:
@@ -44,7 +63,7 @@ def initialize() -> Robot:
 
 def play(robot: Robot):
     """
-    Interactively, play the toy robot game
+    Interactively, play the toy robot game, prompts are only needed for a terminal, piped stdin is read in bulk
     :param robot: Robot
     :return: no return value
     """
@@ -59,6 +78,9 @@ def play(robot: Robot):
         "\nPlease input your command: "
     )
     try:
+        if not sys.stdin.isatty():
+            _play_piped(robot, sys.stdin)
+            return
         while 1:
             command_text = input()
             if command_text == "EOF":
@@ -76,6 +98,47 @@ def play(robot: Robot):
         print("\nBye, welcome to play next time.")
 
 
+def _play_piped(robot: Robot, stream: TextIO):
+    """
+    Play the toy robot game with the commands piped in, the commands are read in large chunks instead of line by line,
+    each line is still an independent order, a bad line is reported and skipped like in the interactive prompt
+    :param robot: Robot
+    :param stream: the piped input stream
+    :return: no return value
+    """
+    for lines in iter(lambda: stream.readlines(STDIN_CHUNK_SIZE), []):
+        for i, line in enumerate(lines):
+            if line.rstrip("\n") == "EOF":
+                _execute_lines(robot, lines[:i])
+                return
+        _execute_lines(robot, lines)
+
+
+def _execute_lines(robot: Robot, lines: List[str]):
+    try:
+        commands = robot.command_interpreter.interpret(lines)
+    except CommandError:
+        commands = []
+        for line in lines:
+            try:
+                commands.extend(robot.command_interpreter.interpret([line]))
+            except CommandError as e:
+                _execute_commands(commands)
+                commands.clear()
+                print(e.args[0])
+                print("Please try a again.")
+    _execute_commands(commands)
+
+
+def _execute_commands(commands: List[Command]):
+    for command in commands:
+        try:
+            command.execute()
+        except ValueError as e:
+            print(e.args[0])
+            print("Please try a again.")
+
+
 def interactive_mode():
     """
     Interactively play the toy robot game
@@ -85,27 +148,130 @@ def interactive_mode():
     play(robot)
 
 
-def automatic_mode(commands_filepath: str):
+def automatic_mode(
+    commands_filepath: str,
+    cache: Optional[ResultCache] = None,
+    use_kernels: bool = False,
+):
     """
     Automatically play the toy robot game
     :param commands_filepath: the path of the file which contains a bunch of commands
+    :param cache: the cache of the results, a file with the same content is answered from the cache without playing
+    :param use_kernels: execute the commands with the kernel of the table size
     :return: no return value
     """
-    robot = Robot(Navigator(Table()))
-    with open(commands_filepath, "r", encoding="utf-8") as file:
-        try:
-            robot.await_orders(file.readlines())
-        except CommandError as e:
-            print(e.args[0])
-            print("Please try a again.")
-        except ValueError as e:
-            print(e.args[0])
-            print("Please try a again.")
+    robot = (KernelRobot if use_kernels else Robot)(Navigator(Table()))
+    if cache is None:
+        _play_file(robot, commands_filepath)
+        return
 
+    key = file_cache_key(commands_filepath, robot.navigator.table)
+    result = cache.get(key)
+    if result is None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            _play_file(robot, commands_filepath)
+        position = robot.current_position
+        result = CachedResult(output.getvalue(), str(position) if position else None)
+        cache.put(key, result)
+    sys.stdout.write(result.output)
 
-if __name__ == "__main__":
-    args = sys.argv
-    if len(args) < 2:
-        interactive_mode()
+
+def _play_file(robot: Robot, commands_filepath: str):
+    try:
+        run_file(robot, commands_filepath)
+    except CommandError as e:
+        print(e.args[0])
+        print("Please try a again.")
+    except ValueError as e:
+        print(e.args[0])
+        print("Please try a again.")
+
+
+def batch_mode(commands_filepaths: List[str], workers: Optional[int] = None):
+    """
+    Automatically play the command files and print a summary of them
+    :param commands_filepaths: the paths of the files which contain a bunch of commands
+    :param workers: the number of worker processes, default is the number of CPUs
+    :return: no return value
+    """
+    print(summarize(commands_filepaths, workers=workers))
+
+
+def _automatic_mode_all(
+    commands_filepaths: List[str],
+    cache: Optional[ResultCache] = None,
+    use_kernels: bool = False,
+):
+    for commands_filepath in commands_filepaths:
+        automatic_mode(commands_filepath, cache, use_kernels)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Parse the command line arguments and play the toy robot game
+    :param argv: command line arguments, default is sys.argv[1:]
+    :return: no return value
+    """
+    parser = argparse.ArgumentParser(description="Play the toy robot game")
+    parser.add_argument(
+        "commands_filepaths",
+        nargs="*",
+        metavar="commands_filepath",
+        help="the files of commands to play automatically, play interactively if not given",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="print a summary of the files instead of the outputs",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="the number of worker processes to summarize the files, default is the number of CPUs",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="OUTPUT_PREFIX",
+        help="profile the run, write OUTPUT_PREFIX.pstats and OUTPUT_PREFIX.collapsed",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="the number of the most time consuming functions to print when profiling",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="DIRECTORY",
+        help="cache the results of the files in DIRECTORY, a file with the same content is not played again",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="the maximum bytes of the cache, the least recently used results are evicted",
+    )
+    parser.add_argument(
+        "--kernels",
+        action="store_true",
+        help="execute the commands with the precomputed kernel of the table size",
+    )
+    args = parser.parse_args(argv)
+
+    run: Callable[[], None]
+    if args.summary:
+        run = partial(batch_mode, args.commands_filepaths, args.workers)
+    elif args.commands_filepaths:
+        cache = ResultCache(args.cache, args.cache_size) if args.cache else None
+        run = partial(_automatic_mode_all, args.commands_filepaths, cache, args.kernels)
+    else:
+        run = interactive_mode
+    if args.profile:
+        profile(run, args.profile, args.top)
     else:
-        automatic_mode(args[1])
+        run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,25 @@
 """
 Command interpreter which translate string commands into the commands which the robot can understand
 """
+import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from operator import itemgetter
 from types import new_class
-from typing import List, cast, Optional, Dict, Type
+from typing import (
+    Callable,
+    Match,
+    List,
+    cast,
+    Optional,
+    Dict,
+    Type,
+    Set,
+    FrozenSet,
+    Tuple,
+    Iterable,
+    Iterator,
+)
 
 from toy_robot.commands import (
     MoveCommand,
@@ -11,9 +27,12 @@ from toy_robot.commands import (
     RightCommand,
     ReportCommand,
     PlaceCommand,
+    GotoCommand,
+    RepeatCommand,
     Command,
 )
 from toy_robot.models import Facing, RobotPrototype
+from toy_robot.spool import REFERENCE_SIZE, CommandSpool, estimate_size
 
 
 class CommandTranslator(ABC):
@@ -22,6 +41,10 @@ class CommandTranslator(ABC):
     """
 
     command: str
+    # whether the translated command depends on nothing but the command text, so it can be shared by the same lines.
+    # A shared command is executed once per line, so it must not hold any state which changes, nor hand its own
+    # objects to the robot, such as PlaceCommand which gives the robot a copy of its position
+    shareable: bool = False
 
     @classmethod
     @abstractmethod
@@ -80,15 +103,23 @@ class SimpleCommandsTranslatorFactory:
         """
         command_translators: List[CommandTranslator] = []
         for cmd in SIMPLE_COMMANDS:
-            class_name = f"{cmd[0]}{cmd[1:].lower()}CommandTranslator"
-            translator_class = cast(
-                CommandTranslator, new_class(class_name, (CommandTranslator,))
-            )
-            translator_class.command = cmd
-            setattr(translator_class, "translate", classmethod(translate))
-            command_translators.append(translator_class)
+            command_translators.append(cls._build_one(cmd))
         return command_translators
 
+    @staticmethod
+    def _build_one(cmd: str) -> CommandTranslator:
+        class_name = f"{cmd[0]}{cmd[1:].lower()}CommandTranslator"
+        body = {"command": cmd, "shareable": True, "translate": classmethod(translate)}
+        # the attributes are set in the class body, another thread may list the subclasses as soon as it exists
+        return cast(
+            CommandTranslator,
+            new_class(
+                class_name,
+                (CommandTranslator,),
+                exec_body=lambda namespace: namespace.update(body),
+            ),
+        )
+
 
 class PlaceCommandTranslator(CommandTranslator):
     """
@@ -96,45 +127,125 @@ class PlaceCommandTranslator(CommandTranslator):
     """
 
     command = "PLACE"
+    shareable = True
 
     @classmethod
     def translate(cls, robot: RobotPrototype, *args) -> PlaceCommand:
-        if len(args) != 1:
-            raise CommandError(
-                "Place command must have args and args string should be the second "
-                "argument and separated by ',' such as 'PLACE 0,0,NORTH'"
-            )
-        arguments = args[0].split(",")
-        return PlaceCommandTranslator._translate_place_command(robot, arguments)
+        return PlaceCommand(robot, *_translate_position(cls.command, args))
 
-    @staticmethod
-    def _translate_place_command(robot: RobotPrototype, arguments: List[str]):
-        if len(arguments) != 3:
-            raise CommandError(
-                "PLACE command should has 3 args, represent 'x,y,FACING', such as '0,0,NORTH'"
-            )
-        x, y, facing = arguments[0], arguments[1], arguments[2]
 
-        try:
-            return PlaceCommand(robot, int(x), int(y), Facing[facing.upper()])
-        except ValueError as e:
-            raise CommandError(
-                "PLACE command x and y arguments must be integers"
-            ) from e
-        except KeyError as e:
-            raise CommandError(
-                f"PLACE command facing argument must be in {[f.name for f in Facing]}"
-            ) from e
+class GotoCommandTranslator(CommandTranslator):
+    """
+    GotoCommand translator, to translate string typed GOTO command into GotoCommand object
+    """
+
+    command = "GOTO"
+    shareable = True
+
+    @classmethod
+    def translate(cls, robot: RobotPrototype, *args) -> GotoCommand:
+        return GotoCommand(robot, *_translate_position(cls.command, args))
+
+
+# a dict lookup is several times faster than looking up Facing by name
+FACINGS_BY_NAME = {facing.name: facing for facing in Facing}
+# a PLACE line which the built-in translator would split into 'PLACE' and 'x,y,FACING'
+_PLACE_LINE = re.compile(
+    rf"\s*PLACE ([+-]?\d+),([+-]?\d+),({'|'.join(FACINGS_BY_NAME)})\s*", re.IGNORECASE
+)
+
+
+def _translate_position(command: str, args: Tuple[str, ...]) -> Tuple[int, int, Facing]:
+    """
+    Translate the 'x,y,FACING' args of the commands with a position, such as PLACE and GOTO
+    :param command: the command name
+    :param args: arguments for the command
+    :return: x, y and facing
+    """
+    if len(args) != 1:
+        raise CommandError(
+            f"{command.capitalize()} command must have args and args string should be the second "
+            f"argument and separated by ',' such as '{command} 0,0,NORTH'"
+        )
+    arguments = args[0].split(",")
+    if len(arguments) != 3:
+        raise CommandError(
+            f"{command} command should has 3 args, represent 'x,y,FACING', such as '0,0,NORTH'"
+        )
+    x, y, facing = arguments
+
+    try:
+        return int(x), int(y), FACINGS_BY_NAME[facing.upper()]
+    except ValueError as e:
+        raise CommandError(
+            f"{command} command x and y arguments must be integers"
+        ) from e
+    except KeyError as e:
+        raise CommandError(
+            f"{command} command facing argument must be in {[f.name for f in Facing]}"
+        ) from e
+
+
+REPEAT_COMMAND = "REPEAT"
+_FIRST_WORD = re.compile(r"[^\s,()]+")
+
+
+def _split_sequence(text: str, commands: Set[str]) -> List[str]:
+    """
+    Split comma separated commands, the commas inside parentheses are kept, and so are the commas which are not
+    followed by a command, a '(' or another separator, they separate the args of a command, such as 'PLACE 0,0,NORTH'
+    :param text: comma separated commands
+    :param commands: names of the known commands, in upper case
+    :return: list of string typed commands
+    """
+    items, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                break
+        elif char == "," and depth == 0 and _starts_command(text[i + 1 :], commands):
+            items.append(text[start:i])
+            start = i + 1
+    if depth != 0:
+        raise CommandError(f"Parentheses are not balanced in '{text}'")
+    items.append(text[start:])
+    return items
+
+
+def _starts_command(text: str, commands: Set[str]) -> bool:
+    text = text.lstrip()
+    if not text or text[0] in ",(":
+        return True
+    word = _FIRST_WORD.match(text)
+    return word is not None and word.group().upper() in commands
+
+
+def _no_match(_: str) -> None:
+    return None
+
+
+_COMMAND_OF_LINE = itemgetter(1)
 
 
 class CommandsInterpreter:
     """
-    A command interpreter for a robot
+    A command interpreter for a robot. Besides the commands of the registered translators, it understands the REPEAT
+    command and the registered macros, they are compiled into a command holding their comma separated sub commands,
+    such as 'REPEAT 1000 MOVE,LEFT', the sub commands are translated once and never unrolled
     """
 
+    max_shared_commands = 4096
+    # bytes of the translated commands to keep in memory by spool, the rest are spilled to a temporary file
+    memory_budget: Optional[int] = None
+
     def __init__(self, robot: RobotPrototype):
         self.translators: dict = {}
+        self.macros: Dict[str, str] = {}
         self.robot = robot
+        self._shared_commands: OrderedDict[str, Command] = OrderedDict()
         self._register_default_translators()
 
     def interpret(self, command_list: List[str]) -> List[Command]:
@@ -143,14 +254,102 @@ class CommandsInterpreter:
         :param command_list:  a bunch of string typed commands
         :return: list of concrete Command objects
         """
-        commands: List[Command] = []
-        for command_text in command_list:
-            command = self._interpret_one_command(command_text)
-            if command:
-                commands.append(command)
-        return commands
+        return list(self.iter_interpret(command_list))
+
+    def iter_interpret(self, command_texts: Iterable[str]) -> Iterator[Command]:
+        """
+        Lazily interpret string typed commands from any iterable, such as a file, a pipe or another generator, the
+        lines translated into shareable commands are looked up by their text instead of being parsed again, the least
+        recently used lines are evicted when there are more than max_shared_commands of them
+        :param command_texts: string typed commands
+        :return: iterator of concrete Command objects
+        """
+        return map(_COMMAND_OF_LINE, self._interpret_lines(command_texts))
+
+    def spool(
+        self, command_texts: Iterable[str], memory_budget: Optional[int] = None
+    ) -> CommandSpool:
+        """
+        Interpret all the string typed commands before returning, like interpret, but the commands over the memory
+        budget are spilled to a temporary file and read back when the spool is iterated, the spool should be closed
+        :param command_texts: string typed commands
+        :param memory_budget: bytes of the commands to keep in memory, default is the memory_budget of the interpreter
+        :return: CommandSpool
+        """
+        if memory_budget is None:
+            memory_budget = self.memory_budget
+        if memory_budget is None:
+            return CommandSpool(
+                self.robot,
+                self._reinterpret,
+                commands=list(self.iter_interpret(command_texts)),
+            )
+        spool = CommandSpool(self.robot, self._reinterpret, memory_budget)
+        for command_text, command, shared in self._interpret_lines(command_texts):
+            size = REFERENCE_SIZE
+            if not shared:
+                size += estimate_size(command)
+            spool.append(command, command_text, size)
+        return spool
+
+    def _reinterpret(self, command_text: str) -> Iterable[Command]:
+        return self.iter_interpret((command_text,))
+
+    def _interpret_lines(
+        self, command_texts: Iterable[str]
+    ) -> Iterator[Tuple[str, Command, bool]]:
+        """
+        Interpret the lines in one pass, a line is looked up in the shared commands first, a PLACE line of the usual
+        form 'PLACE x,y,FACING' is translated straight into a PlaceCommand when PLACE has the built-in translator, and
+        the other lines are dispatched to their translators by _translate
+        :param command_texts: string typed commands
+        :return: iterator of the non-empty lines, their commands and whether the commands are shared by the same lines
+        """
+        shared_commands = self._shared_commands
+        max_shared_commands = self.max_shared_commands
+        robot = self.robot
+        place_line: Callable[[str], Optional[Match[str]]] = _PLACE_LINE.fullmatch
+        if self.translators.get("PLACE") is not PlaceCommandTranslator:
+            place_line = _no_match
+        for command_text in command_texts:
+            command = shared_commands.get(command_text)
+            if command is not None:
+                try:
+                    shared_commands.move_to_end(command_text)
+                except KeyError:
+                    # another thread has just evicted the line
+                    pass
+                yield command_text, command, True
+                continue
+
+            match = place_line(command_text)
+            if match is not None:
+                x, y, facing = match.groups()
+                command = PlaceCommand(
+                    robot, int(x), int(y), FACINGS_BY_NAME[facing.upper()]
+                )
+                shareable = True
+            else:
+                translated = self._translate(command_text)
+                if translated is None:
+                    continue
+                command, shareable = translated
+            shared = shareable and max_shared_commands > 0
+            if shared:
+                shared_commands[command_text] = command
+                if len(shared_commands) > max_shared_commands:
+                    shared_commands.popitem(last=False)
+            yield command_text, command, shared
 
-    def _interpret_one_command(self, command_text: str) -> Optional[Command]:
+    def _translate(
+        self, command_text: str, expanding: FrozenSet[str] = frozenset()
+    ) -> Optional[Tuple[Command, bool]]:
+        """
+        Translate a string typed command
+        :param command_text: a string typed command
+        :param expanding: names of the macros being expanded, which the command is a part of
+        :return: the command and whether it can be shared by the same lines, None for an empty line
+        """
         command_and_args = command_text.strip().split(" ")
         if command_and_args and command_and_args[0]:
             cmd = command_and_args[0].upper()
@@ -158,13 +357,83 @@ class CommandsInterpreter:
             if len(command_and_args) > 1:
                 args = command_and_args[1:]
 
+            if cmd == REPEAT_COMMAND:
+                return self._compile_repeat(args, expanding)
+            if cmd in self.macros:
+                return self._expand_macro(cmd, args, expanding)
             if cmd not in self.translators:
                 raise CommandError(
                     f"Unsupported command of {cmd}, supported commands: {list(self.translators)}"
                 )
-            return self.translators[cmd].translate(self.robot, *args)
+            translator = self.translators[cmd]
+            return translator.translate(self.robot, *args), translator.shareable
         return None
 
+    def _compile_repeat(
+        self, args: List[str], expanding: FrozenSet[str]
+    ) -> Tuple[Command, bool]:
+        try:
+            count = int(args[0])
+        except (IndexError, ValueError):
+            count = -1
+        commands: List[Command] = []
+        shareable = True
+        if count >= 0 and len(args) >= 2:
+            commands, shareable = self._compile_sequence(" ".join(args[1:]), expanding)
+        if not commands:
+            raise CommandError(
+                "REPEAT command should have a non-negative count and comma separated commands, "
+                "such as 'REPEAT 3 MOVE,LEFT'"
+            )
+        return RepeatCommand(self.robot, count, commands), shareable
+
+    def _expand_macro(
+        self, name: str, args: List[str], expanding: FrozenSet[str]
+    ) -> Tuple[Command, bool]:
+        if name in expanding:
+            raise CommandError(f"Macro {name} should not expand into itself")
+        try:
+            text = self.macros[name].format(*args)
+        except (IndexError, KeyError) as e:
+            raise CommandError(
+                f"Macro {name} has not enough args for '{self.macros[name]}'"
+            ) from e
+        commands, shareable = self._compile_sequence(text, expanding | {name})
+        if len(commands) == 1:
+            return commands[0], shareable
+        return RepeatCommand(self.robot, 1, commands), shareable
+
+    def _compile_sequence(
+        self, text: str, expanding: FrozenSet[str]
+    ) -> Tuple[List[Command], bool]:
+        """
+        Compile comma separated commands, a REPEAT command takes all the commands after it as the commands to repeat,
+        parentheses can group the commands to end it earlier, such as 'REPEAT 4 (REPEAT 3 MOVE),RIGHT'
+        :param text: comma separated commands
+        :param expanding: names of the macros being expanded, which the commands are a part of
+        :return: the commands, and whether the commands can be shared by the same lines
+        """
+        commands: List[Command] = []
+        shareable = True
+        items = _split_sequence(text, {REPEAT_COMMAND, *self.translators, *self.macros})
+        for i, item in enumerate(items):
+            item = item.strip()
+            if item.startswith("(") and item.endswith(")"):
+                group, group_shareable = self._compile_sequence(item[1:-1], expanding)
+                commands.extend(group)
+                shareable = shareable and group_shareable
+                continue
+            repeat = item.split(" ", 1)[0].upper() == REPEAT_COMMAND
+            if repeat:
+                item = ",".join(items[i:])
+            translated = self._translate(item, expanding)
+            if translated:
+                commands.append(translated[0])
+                shareable = shareable and translated[1]
+            if repeat:
+                break
+        return commands, shareable
+
     def _register_default_translators(self):
         SimpleCommandsTranslatorFactory.build()
         for translator_class in CommandTranslator.__subclasses__():
@@ -177,3 +446,19 @@ class CommandsInterpreter:
         :return:
         """
         self.translators[translator_class.command] = translator_class
+        self._shared_commands.clear()
+
+    def register_macro(self, name: str, template: str):
+        """
+        Register a macro command, the macro is expanded by formatting the template with the args of the macro command,
+        such as a macro 'SQUARE' with template 'REPEAT 4 (REPEAT {0} MOVE),RIGHT', then 'SQUARE 3' orders the robot to
+        walk along a square whose side is 3 steps
+        :param name: name of the macro command
+        :param template: comma separated commands, '{0}', '{1}'... are replaced by the args of the macro command
+        :return:
+        """
+        name = name.upper()
+        if name == REPEAT_COMMAND or name in self.translators:
+            raise ValueError(f"Macro {name} should not replace an existing command")
+        self.macros[name] = template
+        self._shared_commands.clear()
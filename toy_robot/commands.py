@@ -2,6 +2,7 @@
 Commands for the robot
 """
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 from toy_robot.models import Facing, Position, RobotPrototype
 
@@ -32,7 +33,21 @@ class PlaceCommand(Command):
         self.position = Position(x, y, facing)
 
     def execute(self) -> None:
-        self.robot.set_position(self.position)
+        position = self.position
+        self.robot.set_position(Position(position.x, position.y, position.facing))
+
+
+class GotoCommand(Command):
+    """
+    GOTO command, used to move the robot to a position along the shortest route
+    """
+
+    def __init__(self, robot: RobotPrototype, x: int, y: int, facing: Facing):
+        super().__init__(robot)
+        self.position = Position(x, y, facing)
+
+    def execute(self) -> None:
+        self.robot.goto(self.position)
 
 
 class MoveCommand(Command):
@@ -69,3 +84,20 @@ class ReportCommand(Command):
 
     def execute(self) -> None:
         self.robot.report()
+
+
+class RepeatCommand(Command):
+    """
+    REPEAT command, used to execute a sequence of commands for a number of times, the sequence is never unrolled
+    """
+
+    def __init__(self, robot: RobotPrototype, count: int, commands: Sequence[Command]):
+        super().__init__(robot)
+        self.count = count
+        self.commands = tuple(commands)
+
+    def execute(self) -> None:
+        executes = [command.execute for command in self.commands]
+        for _ in range(self.count):
+            for execute in executes:
+                execute()
@@ -0,0 +1,219 @@
+"""
+Columnar export of the REPORT results of batch runs. Instead of printing 'Output: x,y,FACING', the reports are kept
+in typed arrays of file id, line number, x, y and facing code, and flushed in chunks to CSV or NumPy .npy files, so
+the downstream analytics can load them without parsing text
+"""
+import csv
+import os
+from array import array
+from typing import Optional, Tuple, Iterable
+
+from toy_robot.command_interpreter import CommandError
+from toy_robot.models import Navigator, Position, Table
+from toy_robot.robot import Robot, _ensure_place_command_first
+from toy_robot.two_phase import iter_file_commands
+
+COLUMNS = ("file_id", "line", "x", "y", "facing")
+
+
+class ReportColumns:
+    """
+    Reports stored column by column in typed arrays, the facing code is the value of Facing
+    """
+
+    def __init__(self):
+        self.file_ids = array("q")
+        self.lines = array("q")
+        self.xs = array("q")
+        self.ys = array("q")
+        self.facings = array("b")
+
+    def append(self, file_id: int, line: int, position: Position) -> None:
+        """
+        Append a report
+        :param file_id: id of the command file
+        :param line: line number of the REPORT command
+        :param position: the reported position
+        :return: no return value
+        """
+        self.file_ids.append(file_id)
+        self.lines.append(line)
+        self.xs.append(position.x)
+        self.ys.append(position.y)
+        self.facings.append(position.facing.value)
+
+    def columns(self) -> Tuple[array, ...]:
+        """
+        The columns in the order of COLUMNS
+        :return: tuple of typed arrays
+        """
+        return self.file_ids, self.lines, self.xs, self.ys, self.facings
+
+    def clear(self) -> None:
+        """
+        Remove all the reports
+        :return: no return value
+        """
+        for column in self.columns():
+            del column[:]
+
+    def __len__(self) -> int:
+        return len(self.file_ids)
+
+
+class CsvReportWriter:
+    """
+    Write the chunks of reports into one CSV file
+    """
+
+    def __init__(self, filepath: str):
+        self.file = open(  # pylint: disable=consider-using-with
+            filepath, "w", encoding="utf-8", newline=""
+        )
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, reports: ReportColumns) -> None:
+        """
+        Write a chunk of reports
+        :param reports: the reports to write
+        :return: no return value
+        """
+        self.writer.writerows(zip(*reports.columns()))
+
+    def close(self) -> None:
+        """
+        Close the CSV file
+        :return: no return value
+        """
+        self.file.close()
+
+
+class NpyReportWriter:
+    """
+    Write each chunk of reports into a .npy file of a NumPy structured array, named by the chunk number
+    """
+
+    def __init__(self, directory: str):
+        try:
+            import numpy  # type: ignore # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ImportError("NumPy is required to export reports to .npy") from e
+        self.numpy = numpy
+        self.directory = directory
+        self.chunks = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, reports: ReportColumns) -> None:
+        """
+        Write a chunk of reports
+        :param reports: the reports to write
+        :return: no return value
+        """
+        numpy = self.numpy
+        dtype = [(name, "<i8") for name in COLUMNS[:-1]] + [(COLUMNS[-1], "i1")]
+        chunk = numpy.empty(len(reports), dtype=dtype)
+        for (name, column_type), column in zip(dtype, reports.columns()):
+            chunk[name] = numpy.frombuffer(column, dtype=column_type)
+        numpy.save(
+            os.path.join(self.directory, f"reports-{self.chunks:06d}.npy"), chunk
+        )
+        self.chunks += 1
+
+    def close(self) -> None:
+        """
+        Nothing to close, every chunk is a complete file
+        :return: no return value
+        """
+
+
+class ReportExporter:
+    """
+    Collect reports and flush them to the writer in chunks
+    """
+
+    def __init__(self, writer, chunk_size: int = 1 << 16):
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.reports = ReportColumns()
+
+    def record(self, file_id: int, line: int, position: Position) -> None:
+        """
+        Record a report, the reports are flushed when a chunk is full
+        :param file_id: id of the command file
+        :param line: line number of the REPORT command
+        :param position: the reported position
+        :return: no return value
+        """
+        self.reports.append(file_id, line, position)
+        if len(self.reports) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the recorded reports
+        :return: no return value
+        """
+        if self.reports:
+            self.writer.write(self.reports)
+            self.reports.clear()
+
+    def close(self) -> None:
+        """
+        Write the rest of the reports and close the writer
+        :return: no return value
+        """
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self) -> "ReportExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ExportingRobot(Robot):
+    """
+    A robot which records its reports to an exporter instead of printing them
+    """
+
+    def __init__(
+        self,
+        navigator: Navigator,
+        exporter: ReportExporter,
+        position: Optional[Position] = None,
+    ):
+        super().__init__(navigator, position)
+        self.exporter = exporter
+        self.file_id = 0
+        self.line = 0
+
+    @_ensure_place_command_first
+    def report(self) -> None:
+        assert self.current_position is not None
+        self.exporter.record(self.file_id, self.line, self.current_position)
+
+
+def export_reports(
+    commands_filepaths: Iterable[str],
+    exporter: ReportExporter,
+    table: Optional[Table] = None,
+) -> None:
+    """
+    Play the command files in the same way as the automatic mode, and export the reports, the file id is the index
+    of the file in commands_filepaths
+    :param commands_filepaths: the paths of the files which contain a bunch of commands
+    :param exporter: the exporter to record the reports
+    :param table: the table the commands are played on, default is a 5x5 table
+    :return: no return value
+    """
+    robot = ExportingRobot(Navigator(table or Table()), exporter)
+    for robot.file_id, commands_filepath in enumerate(commands_filepaths):
+        robot.reset()
+        try:
+            for robot.line, command in iter_file_commands(robot, commands_filepath):
+                command.execute()
+        except (CommandError, ValueError) as e:
+            print(e.args[0])
+            print("Please try a again.")
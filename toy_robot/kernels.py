@@ -0,0 +1,172 @@
+"""
+Execution kernels specialized for a table size. A robot state (x, y, facing) is numbered as (y * width + x) * 4 +
+facing, and -1 means the robot is not on the table. For a table up to KERNEL_MAX_STATES states, the next state of
+MOVE, LEFT and RIGHT are precomputed into flat arrays, so executing a command is an integer indexing without bounds
+checks or Position allocation, a refused MOVE keeps the same state. Bigger tables fall back to the arithmetic kernel.
+"""
+from array import array
+from functools import lru_cache
+from typing import Iterable, List, Optional, Union
+
+from toy_robot.commands import (
+    Command,
+    LeftCommand,
+    MoveCommand,
+    PlaceCommand,
+    ReportCommand,
+    RightCommand,
+)
+from toy_robot.models import Facing, Position, Table
+from toy_robot.robot import PLACE_FIRST_MESSAGE, REFUSE_MESSAGE, Robot
+
+KERNEL_MAX_STATES = 1 << 20
+
+FACINGS = tuple(Facing)
+
+# x and y offsets of MOVE for each facing
+_STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+_ORDERS_NEED_PLACE = (MoveCommand, LeftCommand, RightCommand, ReportCommand)
+
+
+class _ArithmeticMoves:
+    """
+    The next states of MOVE, calculated on demand
+    """
+
+    def __init__(self, width: int, length: int):
+        self.width, self.length = width, length
+
+    def __getitem__(self, state: int) -> int:
+        cell, facing = divmod(state, 4)
+        y, x = divmod(cell, self.width)
+        dx, dy = _STEPS[facing]
+        if 0 <= x + dx < self.width and 0 <= y + dy < self.length:
+            return state + (dy * self.width + dx) * 4
+        return state
+
+
+class _ArithmeticTurns:
+    """
+    The next states of LEFT or RIGHT, calculated on demand
+    """
+
+    def __init__(self, turn: int):
+        self.turn = turn
+
+    def __getitem__(self, state: int) -> int:
+        return state - state % 4 + (state + self.turn) % 4
+
+
+class Kernel:
+    """
+    Next state lookups of MOVE, LEFT and RIGHT for a table
+    """
+
+    def __init__(self, table: Table, max_states: int = KERNEL_MAX_STATES):
+        self.width, self.length = table.max_x + 1, table.max_y + 1
+        self.moves: Union[array, _ArithmeticMoves] = _ArithmeticMoves(
+            self.width, self.length
+        )
+        self.lefts: Union[array, _ArithmeticTurns] = _ArithmeticTurns(3)
+        self.rights: Union[array, _ArithmeticTurns] = _ArithmeticTurns(1)
+        self.precomputed = self.width * self.length * 4 <= max_states
+        if self.precomputed:
+            states = range(self.width * self.length * 4)
+            self.moves = array("i", map(self.moves.__getitem__, states))
+            self.lefts = array("i", map(self.lefts.__getitem__, states))
+            self.rights = array("i", map(self.rights.__getitem__, states))
+
+    def encode(self, position: Optional[Position]) -> int:
+        """
+        Number the state of a position
+        :param position: a position on the table, or None
+        :return: the state number, -1 if the position is None
+        """
+        if position is None:
+            return -1
+        return (position.y * self.width + position.x) * 4 + position.facing.value
+
+    def decode(self, state: int) -> Optional[Position]:
+        """
+        Turn a state number back into a position
+        :param state: the state number
+        :return: the position, None if the state is -1
+        """
+        if state < 0:
+            return None
+        cell, facing = divmod(state, 4)
+        y, x = divmod(cell, self.width)
+        return Position(x, y, FACINGS[facing])
+
+
+@lru_cache(maxsize=16)
+def kernel_for(width: int, length: int, max_states: int = KERNEL_MAX_STATES) -> Kernel:
+    """
+    Get the kernel for a table size, the kernels are cached
+    :param width: width of the table
+    :param length: length of the table
+    :param max_states: the maximum number of states to precompute the transitions for
+    :return: Kernel
+    """
+    return Kernel(Table(width, length), max_states)
+
+
+def execute_commands(
+    robot: Robot, commands: Iterable[Command], max_states: int = KERNEL_MAX_STATES
+) -> None:
+    """
+    Execute the commands with the kernel of the robot's table, the output and the final position are the same as
+    executing the commands one by one. The commands other than PLACE, MOVE, LEFT, RIGHT and REPORT, and the robots
+    of Robot subclasses other than KernelRobot are executed in the normal way.
+    :param robot: the robot to execute the commands
+    :param commands: the commands to execute
+    :param max_states: the maximum number of states to precompute the transitions for
+    :return: no return value
+    """
+    if type(robot) not in (Robot, KernelRobot):
+        for command in commands:
+            command.execute()
+        return
+
+    table = robot.navigator.table
+    kernel = kernel_for(table.max_x + 1, table.max_y + 1, max_states)
+    moves, lefts, rights = kernel.moves, kernel.lefts, kernel.rights
+    state = kernel.encode(robot.current_position)
+    try:
+        for command in commands:
+            kind = type(command)
+            if state < 0 and kind in _ORDERS_NEED_PLACE:
+                print(PLACE_FIRST_MESSAGE)
+            elif kind is MoveCommand:
+                next_state = moves[state]
+                if next_state == state:
+                    print(REFUSE_MESSAGE)
+                state = next_state
+            elif kind is LeftCommand:
+                state = lefts[state]
+            elif kind is RightCommand:
+                state = rights[state]
+            elif kind is ReportCommand:
+                print(f"Output: {kernel.decode(state)}")
+            elif isinstance(command, PlaceCommand) and robot.navigator.safe(
+                command.position
+            ):
+                state = kernel.encode(command.position)
+            else:
+                robot.current_position = kernel.decode(state)
+                command.execute()
+                state = kernel.encode(robot.current_position)
+    finally:
+        robot.current_position = kernel.decode(state)
+
+
+class KernelRobot(Robot):
+    """
+    A robot which executes its orders with the kernel of its table, the output and the final position are the same as
+    Robot
+    """
+
+    def await_orders(self, commands: List[str]):
+        with self.command_interpreter.spool(commands) as cmds:
+            execute_commands(self, cmds)
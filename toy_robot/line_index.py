@@ -0,0 +1,182 @@
+"""
+Line index for command files. The indexer validates a whole command file in one pass and records where the PLACE
+commands are, PLACE is the only command which completely resets the robot state, so a slice of a big command file can
+be executed by seeking to the nearest prior PLACE instead of replaying the file from the start
+"""
+import json
+import os
+from bisect import bisect_right
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, asdict
+from itertools import islice
+from typing import Iterator, List, Optional
+
+from toy_robot.command_interpreter import CommandError
+from toy_robot.commands import PlaceCommand
+from toy_robot.models import Navigator, Table
+from toy_robot.robot import Robot
+from toy_robot.two_phase import iter_raw_lines
+
+INDEX_SUFFIX = ".idx"
+CHECKPOINT_INTERVAL = 4096
+
+
+@dataclass
+class LineIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    Index of a command file, line numbers start from 1 and offsets are byte offsets of the beginning of the lines,
+    a line ends at "\n", "\r\n" or "\r", a checkpoint is recorded every checkpoint_interval lines
+    """
+
+    file_size: int
+    line_count: int
+    max_x: int
+    max_y: int
+    place_lines: List[int] = field(default_factory=list)
+    place_offsets: List[int] = field(default_factory=list)
+    checkpoint_offsets: List[int] = field(default_factory=list)
+    checkpoint_interval: int = CHECKPOINT_INTERVAL
+    file_mtime_ns: int = 0
+
+    def save(self, index_filepath: str) -> None:
+        """
+        Save the index into a file
+        :param index_filepath: path of the index file
+        :return: no return value
+        """
+        with open(index_filepath, "w", encoding="utf-8") as file:
+            json.dump(asdict(self), file)
+
+    @classmethod
+    def load(cls, index_filepath: str) -> "LineIndex":
+        """
+        Load the index from a file
+        :param index_filepath: path of the index file
+        :return: LineIndex
+        """
+        with open(index_filepath, "r", encoding="utf-8") as file:
+            return cls(**json.load(file))
+
+
+def build_index(
+    commands_filepath: str,
+    table: Optional[Table] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+) -> LineIndex:
+    """
+    Validate every line of a command file and index the PLACE commands which put the robot on the table
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :param table: the table the commands are played on, default is a 5x5 table
+    :param checkpoint_interval: the number of lines between two checkpoints
+    :return: LineIndex
+    """
+    robot = Robot(Navigator(table or Table()))
+    table = robot.navigator.table
+    stat = os.stat(commands_filepath)
+    index = LineIndex(
+        stat.st_size,
+        0,
+        table.max_x,
+        table.max_y,
+        checkpoint_interval=checkpoint_interval,
+        file_mtime_ns=stat.st_mtime_ns,
+    )
+    offset = 0
+    with open(commands_filepath, "rb") as file:
+        for line_number, line in enumerate(iter_raw_lines(file), 1):
+            if (line_number - 1) % checkpoint_interval == 0:
+                index.checkpoint_offsets.append(offset)
+            try:
+                commands = robot.command_interpreter.interpret([line.decode("utf-8")])
+            except CommandError as e:
+                raise CommandError(f"Line {line_number}: {e.args[0]}") from e
+            if (
+                commands
+                and isinstance(commands[0], PlaceCommand)
+                and robot.navigator.safe(commands[0].position)
+            ):
+                index.place_lines.append(line_number)
+                index.place_offsets.append(offset)
+            offset += len(line)
+            index.line_count = line_number
+    return index
+
+
+def write_index(
+    commands_filepath: str,
+    table: Optional[Table] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+) -> LineIndex:
+    """
+    Build the index of a command file and save it as a sidecar file next to the command file
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :param table: the table the commands are played on, default is a 5x5 table
+    :param checkpoint_interval: the number of lines between two checkpoints
+    :return: LineIndex
+    """
+    index = build_index(commands_filepath, table, checkpoint_interval)
+    index.save(commands_filepath + INDEX_SUFFIX)
+    return index
+
+
+def load_index(commands_filepath: str) -> LineIndex:
+    """
+    Load the sidecar index of a command file
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :return: LineIndex
+    """
+    index = LineIndex.load(commands_filepath + INDEX_SUFFIX)
+    stat = os.stat(commands_filepath)
+    if (index.file_size, index.file_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        raise ValueError(
+            f"The index of {commands_filepath} is out of date, please rebuild it"
+        )
+    return index
+
+
+def run_lines(
+    robot: Robot,
+    commands_filepath: str,
+    first: int,
+    last: int,
+    index: Optional[LineIndex] = None,
+):
+    """
+    Execute the lines from first to last (both included) of an indexed command file, the robot state is rebuilt by
+    replaying quietly from the nearest PLACE before the first line
+    :param robot: the robot to execute the commands, it is reset before the run
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :param first: the first line to execute, line numbers start from 1
+    :param last: the last line to execute
+    :param index: the index of the command file, the sidecar index is loaded if not given
+    :return: no return value
+    """
+    index = index or load_index(commands_filepath)
+    if not 1 <= first <= last <= index.line_count:
+        raise ValueError(
+            f"Lines to run should be in the range of 1 to {index.line_count}"
+        )
+    table = robot.navigator.table
+    if (table.max_x, table.max_y) != (index.max_x, index.max_y):
+        raise ValueError("The index is built for a table of different size")
+
+    robot.reset()
+    i = bisect_right(index.place_lines, first) - 1
+    with open(commands_filepath, "rb") as file:
+        if i >= 0:
+            file.seek(index.place_offsets[i])
+            lines = iter_raw_lines(file)
+            replay = _read_lines(lines, first - index.place_lines[i])
+            with open(os.devnull, "w", encoding="utf-8") as devnull:
+                with redirect_stdout(devnull):
+                    robot.await_orders(replay)
+        else:
+            checkpoint = (first - 1) // index.checkpoint_interval
+            file.seek(index.checkpoint_offsets[checkpoint])
+            lines = iter_raw_lines(file)
+            _read_lines(lines, first - 1 - checkpoint * index.checkpoint_interval)
+        robot.await_orders(_read_lines(lines, last - first + 1))
+
+
+def _read_lines(lines: Iterator[bytes], count: int) -> List[str]:
+    return [line.decode("utf-8") for line in islice(lines, count)]
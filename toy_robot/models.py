@@ -165,6 +165,14 @@ class RobotPrototype(ABC):
         :return: no return value
         """
 
+    @abstractmethod
+    def goto(self, position: Position) -> None:
+        """
+        Move the robot to a position along the shortest route
+        :param position: position to go
+        :return: no return value
+        """
+
     @abstractmethod
     def report(self) -> None:
         """
@@ -172,6 +180,13 @@ class RobotPrototype(ABC):
         :return: no return value
         """
 
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Take the robot off the table, so that it can be reused for a new run
+        :return: no return value
+        """
+
     @abstractmethod
     def await_orders(self, commands: List[str]):
         """
@@ -0,0 +1,176 @@
+"""
+Route planner for the robot, find the shortest sequence of MOVE, LEFT and RIGHT commands to reach a target position.
+A state (x, y, facing) is numbered as (y * width + x) * 4 + facing like the kernels, a distance field is built for each
+target by a breadth first search backwards from the target, the distance fields are cached within a total number of
+states so a repeated target is answered in O(path length). The table has no obstacles, so a table over
+DISTANCE_FIELD_MAX_STATES states is planned directly: move along one axis and then the other, in the order which needs
+the fewest turns
+"""
+import threading
+from array import array
+from collections import OrderedDict, deque
+from typing import List, Tuple
+
+from toy_robot.models import Position, Table
+
+# tables with more states, over 256x256, are planned directly instead of by a distance field
+DISTANCE_FIELD_MAX_STATES = 1 << 18
+# the total states of the cached distance fields, 4 bytes per state, 16 MiB
+DISTANCE_FIELD_CACHE_STATES = 1 << 22
+
+MOVE, LEFT, RIGHT = "MOVE", "LEFT", "RIGHT"
+
+# x and y offsets of MOVE for each facing value
+_STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+def plan_route(table: Table, start: Position, target: Position) -> List[str]:
+    """
+    Plan the shortest route from the start position to the target position
+    :param table: the table the robot stands on
+    :param start: start position, it should be on the table
+    :param target: target position, it should be on the table
+    :return: list of commands, each is one of 'MOVE', 'LEFT' and 'RIGHT'
+    """
+    width, length = table.max_x + 1, table.max_y + 1
+    if width * length * 4 > DISTANCE_FIELD_MAX_STATES:
+        return _plan_directly(start, target)
+
+    distances = DISTANCE_FIELDS.get(
+        width, length, (target.y * width + target.x) * 4 + target.facing.value
+    )
+    state = (start.y * width + start.x) * 4 + start.facing.value
+    distance = distances[state]
+    route: List[str] = []
+    while distance > 0:
+        facing = state & 3
+        dx, dy = _STEPS[facing]
+        x, y = (state >> 2) % width + dx, (state >> 2) // width + dy
+        turned = state - facing
+        if (
+            0 <= x < width
+            and 0 <= y < length
+            and distances[state + (dy * width + dx) * 4] == distance - 1
+        ):
+            route.append(MOVE)
+            state += (dy * width + dx) * 4
+        elif distances[turned + (facing + 3) % 4] == distance - 1:
+            route.append(LEFT)
+            state = turned + (facing + 3) % 4
+        else:
+            route.append(RIGHT)
+            state = turned + (facing + 1) % 4
+        distance -= 1
+    return route
+
+
+def _turns(facing: int, target_facing: int) -> List[str]:
+    turn = (target_facing - facing) % 4
+    return [LEFT] if turn == 3 else [RIGHT] * turn
+
+
+def _plan_directly(start: Position, target: Position) -> List[str]:
+    """
+    Plan the shortest route on a table without obstacles, every MOVE goes towards the target, so the route is the moves
+    along one axis and then the other, with the turns before, between and after them
+    """
+    dx, dy = target.x - start.x, target.y - start.y
+    legs = []
+    if dx:
+        legs.append((1 if dx > 0 else 3, abs(dx)))
+    if dy:
+        legs.append((0 if dy > 0 else 2, abs(dy)))
+    routes = []
+    for ordered_legs in (legs, legs[::-1]):
+        route: List[str] = []
+        facing = start.facing.value
+        for leg_facing, moves in ordered_legs:
+            route += _turns(facing, leg_facing) + [MOVE] * moves
+            facing = leg_facing
+        routes.append(route + _turns(facing, target.facing.value))
+    return min(routes, key=len)
+
+
+class DistanceFieldCache:
+    """
+    Distance fields keyed by the table size and the target state, the least recently used fields are evicted when the
+    cached fields are over max_states states in total
+    """
+
+    def __init__(self, max_states: int = DISTANCE_FIELD_CACHE_STATES):
+        self.max_states = max_states
+        self.fields: "OrderedDict[Tuple[int, int, int], array]" = OrderedDict()
+        self.states = 0
+        self.lock = threading.Lock()
+
+    def get(self, width: int, length: int, target: int) -> array:
+        """
+        Get the distance field of a target state, it is built if not cached
+        :param width: width of the table
+        :param length: length of the table
+        :param target: the target state number
+        :return: the number of commands to reach the target from each state, indexed by the state number
+        """
+        key = (width, length, target)
+        with self.lock:
+            distances = self.fields.get(key)
+            if distances is not None:
+                self.fields.move_to_end(key)
+                return distances
+
+        distances = _build_distance_field(width, length, target)
+        with self.lock:
+            if key not in self.fields:
+                self.fields[key] = distances
+                self.states += len(distances)
+            while self.states > self.max_states and self.fields:
+                self.states -= len(self.fields.popitem(last=False)[1])
+        return distances
+
+    def clear(self) -> None:
+        """
+        Remove the cached distance fields
+        :return: no return value
+        """
+        with self.lock:
+            self.fields.clear()
+            self.states = 0
+
+
+DISTANCE_FIELDS = DistanceFieldCache()
+
+
+def _build_distance_field(width: int, length: int, target: int) -> array:
+    """
+    Breadth first search backwards from the target over the state numbers
+    :return: the number of commands to reach the target from each state, indexed by the state number
+    """
+    distances = array("i", [-1]) * (width * length * 4)
+    distances[target] = 0
+    # the state offset of the MOVE which leads to a state of each facing value
+    move_backs = (-4 * width, -4, 4 * width, 4)
+    queue = deque([target])
+    while queue:
+        state = queue.popleft()
+        distance = distances[state] + 1
+        facing = state & 3
+        turned = state - facing
+        cell = state >> 2
+        # a MOVE back stays on the table unless the state is on the edge behind it
+        if facing == 0:
+            can_move_back = cell >= width
+        elif facing == 1:
+            can_move_back = cell % width > 0
+        elif facing == 2:
+            can_move_back = cell < (length - 1) * width
+        else:
+            can_move_back = cell % width < width - 1
+        for previous in (
+            turned + (facing + 1) % 4,
+            turned + (facing + 3) % 4,
+            state + move_backs[facing] if can_move_back else state,
+        ):
+            if distances[previous] < 0:
+                distances[previous] = distance
+                queue.append(previous)
+    return distances
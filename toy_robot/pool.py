@@ -0,0 +1,90 @@
+"""
+Robot pool which hands out pre-built robots, so that the drivers running a lot of small command scripts do not need to
+build a new robot, navigator, table and command interpreter for each run
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from toy_robot.command_interpreter import CommandsInterpreter
+from toy_robot.models import Navigator, Table
+from toy_robot.robot import Robot
+
+
+class RobotPool:
+    """
+    A pool of idle robots, grouped by the size of the table they stand on, the pool can be shared by threads
+    """
+
+    def __init__(self, max_idle: int = 16):
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[int, int], List[Robot]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def prefill(self, count: int, width: int = 5, length: int = 5) -> None:
+        """
+        Build robots ahead of time
+        :param count: how many robots to build, no more than max_idle robots are kept
+        :param width: width of the table
+        :param length: length of the table
+        :return: no return value
+        """
+        with self._lock:
+            missing = min(count, self.max_idle) - len(self._idle[(width, length)])
+        robots = [Robot(Navigator(Table(width, length))) for _ in range(missing)]
+        with self._lock:
+            idle = self._idle[(width, length)]
+            idle += robots[: self.max_idle - len(idle)]
+
+    def acquire(self, width: int = 5, length: int = 5) -> Robot:
+        """
+        Take an idle robot from the pool, a new robot is built when there is no idle one for the table size
+        :param width: width of the table
+        :param length: length of the table
+        :return: a robot which is not on the table yet
+        """
+        with self._lock:
+            idle = self._idle[(width, length)]
+            if idle:
+                return idle.pop()
+        return Robot(Navigator(Table(width, length)))
+
+    def release(self, robot: Robot) -> None:
+        """
+        Reset the robot and give it back to the pool, the robot gets a new command interpreter, so the macros,
+        translators and settings registered by a borrower are not seen by the next one
+        :param robot: the robot acquired from the pool
+        :return: no return value
+        """
+        robot.reset()
+        robot.command_interpreter = CommandsInterpreter(robot)
+        table = robot.navigator.table
+        with self._lock:
+            idle = self._idle[(table.max_x + 1, table.max_y + 1)]
+            if len(idle) < self.max_idle:
+                idle.append(robot)
+
+    def idle_count(self, width: int = 5, length: int = 5) -> int:
+        """
+        Count the idle robots for a table size
+        :param width: width of the table
+        :param length: length of the table
+        :return: the number of idle robots
+        """
+        with self._lock:
+            return len(self._idle[(width, length)])
+
+    @contextmanager
+    def robot(self, width: int = 5, length: int = 5) -> Iterator[Robot]:
+        """
+        Borrow a robot from the pool for the duration of a with block
+        :param width: width of the table
+        :param length: length of the table
+        :return: a robot which is not on the table yet
+        """
+        robot = self.acquire(width, length)
+        try:
+            yield robot
+        finally:
+            self.release(robot)
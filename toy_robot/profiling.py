@@ -0,0 +1,140 @@
+"""
+Profiling for the toy robot game. A run is profiled by cProfile and sampled by a stack sampler at the same time, the
+pstats file can be loaded by pstats or snakeviz, and the collapsed stacks can be rendered by flamegraph.pl or
+speedscope. A summary of the time spent in each phase is printed to stderr.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from typing import Callable, Dict
+
+PARSING = "parsing"
+TRANSLATION = "translation"
+STATE_UPDATES = "state updates"
+PRINTING = "printing"
+OTHER = "other"
+
+TRANSLATION_FUNCTIONS = {"translate", "_translate_position"}
+STATE_MODULES = {"models.py", "robot.py", "commands.py", "planner.py", "kernels.py"}
+# the phases of the modules, and of the functions which differ from the rest of their modules, two_phase.py scans and
+# prepares the lines, translates the positions, and the orders it prepares update the state
+MODULE_PHASES = {
+    "command_interpreter.py": PARSING,
+    "spool.py": PARSING,
+    "two_phase.py": STATE_UPDATES,
+    **dict.fromkeys(STATE_MODULES, STATE_UPDATES),
+}
+FUNCTION_PHASES = {
+    "command_interpreter.py": dict.fromkeys(TRANSLATION_FUNCTIONS, TRANSLATION),
+    "two_phase.py": {
+        **dict.fromkeys(
+            ("iter_lines", "run_file", "direct_orders", "_prepare", "_simple_order"),
+            PARSING,
+        ),
+        "place": TRANSLATION,
+        "goto": TRANSLATION,
+    },
+}
+
+
+def phase_of(filename: str, function: str) -> str:
+    """
+    Tell which phase a function belongs to
+    :param filename: file name of the function, '~' for built-in functions
+    :param function: function name
+    :return: the phase name
+    """
+    module = os.path.basename(filename)
+    if function == "<built-in method builtins.print>":
+        return PRINTING
+    phase = FUNCTION_PHASES.get(module, {}).get(function)
+    return phase or MODULE_PHASES.get(module, OTHER)
+
+
+class StackSampler(threading.Thread):
+    """
+    Sample the stack of a thread periodically, the samples are counted by their collapsed stacks
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                self.thread_id
+            )
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        """
+        Stop sampling
+        :return: no return value
+        """
+        self._stopped.set()
+        self.join()
+
+    def write_collapsed(self, filepath: str) -> None:
+        """
+        Write the samples in the collapsed stack format, one stack and its count per line
+        :param filepath: path of the output file
+        :return: no return value
+        """
+        with open(filepath, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def phase_times(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Sum up the time spent in the functions of each phase, excluding the time spent in the functions they call
+    :param stats: profiling stats
+    :return: seconds keyed by the phase names
+    """
+    times = dict.fromkeys([PARSING, TRANSLATION, STATE_UPDATES, PRINTING, OTHER], 0.0)
+    for (filename, _, function), stat in stats.stats.items():  # type: ignore
+        times[phase_of(filename, function)] += stat[2]
+    return times
+
+
+def profile(run: Callable[[], None], output_prefix: str, top: int = 10) -> None:
+    """
+    Profile a run, write '{output_prefix}.pstats' and '{output_prefix}.collapsed', and print a summary to stderr
+    :param run: the run to profile
+    :param output_prefix: prefix of the output file paths
+    :param top: the number of the most time consuming functions to print
+    :return: no return value
+    """
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+    sampler.start()
+    try:
+        profiler.runcall(run)
+    finally:
+        sampler.stop()
+        profiler.dump_stats(f"{output_prefix}.pstats")
+        sampler.write_collapsed(f"{output_prefix}.collapsed")
+
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        times = phase_times(stats)
+        total = sum(times.values()) or 1.0
+        print("Time spent in each phase:", file=sys.stderr)
+        for phase, seconds in times.items():
+            print(
+                f"  {phase:<14}{seconds:>10.4f}s {seconds / total:>7.1%}",
+                file=sys.stderr,
+            )
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
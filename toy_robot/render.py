@@ -0,0 +1,206 @@
+"""
+Headless frame rendering of the robot on the table. The frame buffer holds a character per cell, the robot is drawn
+as an arrow of its facing and the cells it has been on as its trail, a step of the robot only redraws the cells it
+leaves and enters and marks them dirty. A frame is written every N steps as ASCII text, or as a PNG image whose pixels
+are only redrawn for the dirty cells, so long runs can be rendered without slowing every step
+"""
+import os
+import struct
+import zlib
+from typing import List, Optional, Set, TextIO
+
+from toy_robot.models import Facing, Navigator, Position, Table
+from toy_robot.robot import Robot
+
+EMPTY = ord(".")
+TRAIL = ord("*")
+ROBOT_GLYPHS = {
+    Facing.NORTH: ord("^"),
+    Facing.EAST: ord(">"),
+    Facing.SOUTH: ord("v"),
+    Facing.WEST: ord("<"),
+}
+# colors of the empty cells, the trail and the robot
+PNG_PALETTE = ((255, 255, 255), (150, 190, 255), (220, 30, 30))
+
+
+class FrameBuffer:
+    """
+    The cells of a table in a flat buffer, the cell of (x, y) is at y * width + x, the dirty cells are the indexes of
+    the cells changed since they were taken last time
+    """
+
+    def __init__(self, table: Table):
+        self.width, self.length = table.max_x + 1, table.max_y + 1
+        self.cells = bytearray([EMPTY]) * (self.width * self.length)
+        self.robot_cell = -1
+        self.dirty: Set[int] = set()
+
+    def draw_robot(self, position: Optional[Position]) -> None:
+        """
+        Draw the robot at its position, and leave a trail at the cell it was on
+        :param position: the position of the robot, None if it is not on the table
+        :return: no return value
+        """
+        cell = self.robot_cell
+        if cell >= 0:
+            self.cells[cell] = TRAIL
+            self.dirty.add(cell)
+        if position is None:
+            self.robot_cell = -1
+            return
+        cell = position.y * self.width + position.x
+        self.cells[cell] = ROBOT_GLYPHS[position.facing]
+        self.robot_cell = cell
+        self.dirty.add(cell)
+
+    def take_dirty(self) -> Set[int]:
+        """
+        Take the dirty cells, they are not dirty afterwards
+        :return: indexes of the dirty cells
+        """
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def text(self) -> str:
+        """
+        The frame as text, the north most row is the first line
+        :return: text of the frame
+        """
+        width = self.width
+        return "\n".join(
+            self.cells[y * width : (y + 1) * width].decode("ascii")
+            for y in reversed(range(self.length))
+        )
+
+
+class TextFrameWriter:
+    """
+    Write the frames as text into a stream, each frame is headed by its step
+    """
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, frame: FrameBuffer, step: int) -> None:
+        """
+        Write a frame
+        :param frame: the frame buffer
+        :param step: the number of steps the robot has taken
+        :return: no return value
+        """
+        frame.take_dirty()
+        self.stream.write(f"Step {step}\n{frame.text()}\n\n")
+
+
+class PngFrameWriter:
+    """
+    Write each frame into a PNG image named by the step, a cell is a square of cell_pixels pixels
+    """
+
+    def __init__(self, directory: str, cell_pixels: int = 4):
+        self.directory = directory
+        self.cell_pixels = cell_pixels
+        self.colors = {EMPTY: 0, TRAIL: 1, **dict.fromkeys(ROBOT_GLYPHS.values(), 2)}
+        self.pixel_rows: List[bytearray] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame: FrameBuffer, step: int) -> None:
+        """
+        Redraw the dirty cells and write a frame
+        :param frame: the frame buffer
+        :param step: the number of steps the robot has taken
+        :return: no return value
+        """
+        pixels = self.cell_pixels
+        if not self.pixel_rows:
+            self.pixel_rows = [
+                bytearray(frame.width * pixels) for _ in range(frame.length * pixels)
+            ]
+            dirty = set(range(len(frame.cells)))
+            frame.take_dirty()
+        else:
+            dirty = frame.take_dirty()
+        for cell in dirty:
+            y, x = divmod(cell, frame.width)
+            color = bytes([self.colors[frame.cells[cell]]]) * pixels
+            top = (frame.length - 1 - y) * pixels
+            for row in self.pixel_rows[top : top + pixels]:
+                row[x * pixels : (x + 1) * pixels] = color
+
+        filepath = os.path.join(self.directory, f"frame-{step:09d}.png")
+        with open(filepath, "wb") as file:
+            file.write(self._png(frame.width * pixels, frame.length * pixels))
+
+    def _png(self, width: int, height: int) -> bytes:
+        data = zlib.compress(b"".join(b"\0" + row for row in self.pixel_rows))
+        return b"".join(
+            [
+                b"\x89PNG\r\n\x1a\n",
+                _png_chunk(
+                    b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+                ),
+                _png_chunk(b"PLTE", bytes(c for color in PNG_PALETTE for c in color)),
+                _png_chunk(b"IDAT", data),
+                _png_chunk(b"IEND", b""),
+            ]
+        )
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+class RenderingRobot(Robot):
+    """
+    A robot which draws itself on a frame buffer at every step, and writes a frame every `every` steps, a step is a
+    PLACE, MOVE, LEFT or RIGHT which is done or refused
+    """
+
+    def __init__(
+        self,
+        navigator: Navigator,
+        writer,
+        every: int = 1,
+        position: Optional[Position] = None,
+    ):
+        self.frame = FrameBuffer(navigator.table)
+        self.writer = writer
+        self.every = every
+        self.steps = 0
+        super().__init__(navigator, position)
+
+    def _step(self) -> None:
+        self.frame.draw_robot(self.current_position)
+        self.steps += 1
+        if self.steps % self.every == 0:
+            self.writer.write(self.frame, self.steps)
+
+    def set_position(self, position: Position) -> None:
+        super().set_position(position)
+        self._step()
+
+    def turn_left(self) -> None:
+        super().turn_left()
+        self._step()
+
+    def turn_right(self) -> None:
+        super().turn_right()
+        self._step()
+
+    def move_forward(self) -> None:
+        super().move_forward()
+        self._step()
+
+    def flush(self) -> None:
+        """
+        Write the last frame if the last step has not been written
+        :return: no return value
+        """
+        if self.steps % self.every:
+            self.writer.write(self.frame, self.steps)
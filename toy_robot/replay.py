@@ -0,0 +1,237 @@
+"""
+Deterministic replay of command files for regression runs. Replaying a command file writes a compact event log, which
+records every message the robot prints (REPORT outputs, refused movements and errors) with its line number, the final
+state of the robot and a sha256 digest of all of them. Two runs can then be diffed to find the first diverging line.
+
+    python toy_robot/replay.py replay ${archive_dir} ${log_dir}
+    python toy_robot/replay.py diff ${log_dir_a} ${log_dir_b}
+"""
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import zip_longest, repeat
+from typing import Dict, Optional, TextIO
+
+from toy_robot.models import Navigator, Table
+from toy_robot.robot import Robot
+from toy_robot.two_phase import LineCommandError, iter_file_commands, iter_raw_lines
+
+LOG_SUFFIX = ".log"
+DIGEST_PREFIX = "sha256\t"
+
+
+class EventLog:
+    """
+    A writable stream which turns the printed messages into events of the current line, every event is written to the
+    log file and hashed incrementally, so nothing is kept in memory
+    """
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.line_number = 0
+        self._digest = hashlib.sha256()
+        self._pending = ""
+
+    def write(self, text: str) -> int:
+        """
+        Receive the text printed by the robot
+        :param text: printed text
+        :return: length of the text
+        """
+        self._pending += text
+        while "\n" in self._pending:
+            message, self._pending = self._pending.split("\n", 1)
+            self.record(self.line_number, message)
+        return len(text)
+
+    def flush(self) -> None:
+        """
+        Nothing to flush, the events are written as soon as a message is complete
+        :return: no return value
+        """
+
+    def record(self, line_number: int, message: str) -> None:
+        """
+        Record an event
+        :param line_number: the line which the event happens on
+        :param message: the event message
+        :return: no return value
+        """
+        entry = f"{line_number}\t{message}\n"
+        self._digest.update(entry.encode("utf-8"))
+        self.file.write(entry)
+
+    def close(self) -> str:
+        """
+        Write the digest of all the events at the end of the log
+        :return: the hex digest
+        """
+        digest = self._digest.hexdigest()
+        self.file.write(f"{DIGEST_PREFIX}{digest}\n")
+        return digest
+
+
+def replay_file(
+    commands_filepath: str, log_filepath: str, table: Optional[Table] = None
+) -> str:
+    """
+    Replay a command file in the same way as the automatic mode and write its event log
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :param log_filepath: the path of the event log to write
+    :param table: the table the commands are played on, default is a 5x5 table
+    :return: the hex digest of the events
+    """
+    robot = Robot(Navigator(table or Table()))
+    with open(log_filepath, "w", encoding="utf-8") as log_file:
+        log = EventLog(log_file)
+        with redirect_stdout(log):  # type: ignore
+            try:
+                for log.line_number, command in iter_file_commands(
+                    robot, commands_filepath
+                ):
+                    command.execute()
+            except LineCommandError as e:
+                log.record(e.line_number, e.args[0])
+            except ValueError as e:
+                log.record(log.line_number, e.args[0])
+        log.record(_count_lines(commands_filepath), f"Final: {robot.current_position}")
+        return log.close()
+
+
+def _count_lines(commands_filepath: str) -> int:
+    with open(commands_filepath, "rb") as file:
+        return sum(1 for _ in iter_raw_lines(file))
+
+
+def replay_archive(
+    archive_dir: str, log_dir: str, workers: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Replay all the command files under a directory in parallel, the event logs keep the same relative paths
+    :param archive_dir: the directory of the command files
+    :param log_dir: the directory to write the event logs
+    :param workers: the number of worker processes, default is the number of CPUs
+    :return: the hex digests keyed by the relative paths of the command files
+    """
+    relative_paths = sorted(
+        os.path.relpath(os.path.join(root, name), archive_dir)
+        for root, _, names in os.walk(archive_dir)
+        for name in names
+    )
+    for relative_path in relative_paths:
+        os.makedirs(
+            os.path.dirname(os.path.join(log_dir, relative_path)), exist_ok=True
+        )
+    with ProcessPoolExecutor(workers) as executor:
+        digests = executor.map(
+            replay_file,
+            [os.path.join(archive_dir, path) for path in relative_paths],
+            [os.path.join(log_dir, path + LOG_SUFFIX) for path in relative_paths],
+            chunksize=64,
+        )
+        return dict(zip(relative_paths, digests))
+
+
+def read_digest(log_filepath: str) -> str:
+    """
+    Read the digest at the end of an event log without reading the whole log
+    :param log_filepath: the path of the event log
+    :return: the hex digest
+    """
+    with open(log_filepath, "rb") as file:
+        file.seek(max(0, os.path.getsize(log_filepath) - len(DIGEST_PREFIX) - 65))
+        return file.read().decode("utf-8").rsplit(DIGEST_PREFIX, 1)[-1].strip()
+
+
+def diff_logs(log_filepath_a: str, log_filepath_b: str) -> Optional[int]:
+    """
+    Compare two event logs of the same command file
+    :param log_filepath_a: the path of an event log
+    :param log_filepath_b: the path of another event log
+    :return: the first line on which the two runs diverge, None if the runs are the same
+    """
+    if read_digest(log_filepath_a) == read_digest(log_filepath_b):
+        return None
+    with (
+        open(log_filepath_a, "r", encoding="utf-8") as file_a,
+        open(log_filepath_b, "r", encoding="utf-8") as file_b,
+    ):
+        for entry_a, entry_b in zip_longest(file_a, file_b, fillvalue=""):
+            if entry_a != entry_b:
+                return min(
+                    int(entry.split("\t", 1)[0])
+                    for entry in (entry_a, entry_b)
+                    if entry and not entry.startswith(DIGEST_PREFIX)
+                )
+    return None
+
+
+def _diff_log(relative_path: str, log_dir_a: str, log_dir_b: str) -> Optional[int]:
+    log_filepath_a = os.path.join(log_dir_a, relative_path)
+    log_filepath_b = os.path.join(log_dir_b, relative_path)
+    if not (os.path.exists(log_filepath_a) and os.path.exists(log_filepath_b)):
+        return 0
+    return diff_logs(log_filepath_a, log_filepath_b)
+
+
+def diff_runs(
+    log_dir_a: str, log_dir_b: str, workers: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Compare the event logs of two runs in parallel
+    :param log_dir_a: the log directory of a run
+    :param log_dir_b: the log directory of another run
+    :param workers: the number of worker processes, default is the number of CPUs
+    :return: the first diverging lines keyed by the relative paths of the diverging logs, the line is 0 when the log
+    only exists in one of the runs
+    """
+    relative_paths = sorted(
+        {
+            os.path.relpath(os.path.join(root, name), log_dir)
+            for log_dir in (log_dir_a, log_dir_b)
+            for root, _, names in os.walk(log_dir)
+            for name in names
+        }
+    )
+    with ProcessPoolExecutor(workers) as executor:
+        lines = executor.map(
+            _diff_log,
+            relative_paths,
+            repeat(log_dir_a),
+            repeat(log_dir_b),
+            chunksize=64,
+        )
+        return {
+            path: line for path, line in zip(relative_paths, lines) if line is not None
+        }
+
+
+def main():
+    """
+    Command line of the replay tool
+    :return: no return value
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    replay_parser = subparsers.add_parser("replay", help="replay an archive")
+    replay_parser.add_argument("archive_dir")
+    replay_parser.add_argument("log_dir")
+    diff_parser = subparsers.add_parser("diff", help="diff the logs of two runs")
+    diff_parser.add_argument("log_dir_a")
+    diff_parser.add_argument("log_dir_b")
+    args = parser.parse_args()
+
+    if args.action == "replay":
+        digests = replay_archive(args.archive_dir, args.log_dir)
+        print(f"Replayed {len(digests)} files")
+    else:
+        diverged = diff_runs(args.log_dir_a, args.log_dir_b)
+        for path, line in diverged.items():
+            print(f"{path}: {'missing' if line == 0 else f'diverges at line {line}'}")
+        print(f"{len(diverged)} files diverged")
+
+
+if __name__ == "__main__":
+    main()
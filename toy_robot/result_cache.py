@@ -0,0 +1,143 @@
+"""
+Content addressed cache of the results of command files. A command file always gives the same output and final
+position on the same table size, so the result is keyed by the hash of the file content and the table size, and a
+repeated file is answered from the cache without interpreting or executing it. The entries are files in a local
+directory, the least recently used entries are evicted when the directory grows over the size limit. The key includes
+the cache version, which is bumped when the output of a command file changes, so the entries of an older version are
+never answered and are evicted in time
+"""
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from toy_robot.models import Table
+
+CACHE_VERSION = 1
+ENTRY_SUFFIX = ".json"
+DEFAULT_MAX_BYTES = 64 << 20
+HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class CachedResult:
+    """
+    Result of a command file, the printed output and the final position, None if the robot is not on the table
+    """
+
+    output: str
+    position: Optional[str]
+
+
+def cache_key(content: bytes, table: Table) -> str:
+    """
+    Key of a command file on a table
+    :param content: content of the command file
+    :param table: the table the commands are played on
+    :return: hex digest of the cache version, the table size and the content
+    """
+    digest = _table_digest(table)
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def file_cache_key(commands_filepath: str, table: Table) -> str:
+    """
+    Key of a command file on a table, the file is hashed chunk by chunk, the same as cache_key of its content
+    :param commands_filepath: the path of the command file
+    :param table: the table the commands are played on
+    :return: hex digest of the cache version, the table size and the file content
+    """
+    digest = _table_digest(table)
+    with open(commands_filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _table_digest(table: Table):
+    return hashlib.sha256(
+        f"v{CACHE_VERSION}\n{table.max_x + 1}x{table.max_y + 1}\n".encode()
+    )
+
+
+class ResultCache:
+    """
+    Results of command files stored in a directory, one file per entry, the modification time of an entry is the time
+    it was used last. The sizes of the entries are kept in the least recently used order in memory, the directory is
+    only scanned when the cache is opened
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sizes: OrderedDict[str, int] = OrderedDict()
+        self.total = 0
+        os.makedirs(directory, exist_ok=True)
+        entries = [
+            (entry.stat(), entry.name[: -len(ENTRY_SUFFIX)])
+            for entry in os.scandir(directory)
+            if entry.name.endswith(ENTRY_SUFFIX)
+        ]
+        for stat, key in sorted(entries, key=lambda e: e[0].st_mtime_ns):
+            self._add(key, stat.st_size)
+        self.evict()
+
+    def _add(self, key: str, size: int) -> None:
+        self.total += size - self.sizes.pop(key, 0)
+        self.sizes[key] = size
+
+    def _discard(self, key: str) -> None:
+        self.total -= self.sizes.pop(key, 0)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """
+        Get the result of a key and mark it as recently used
+        :param key: the key of the command file
+        :return: CachedResult, None if the key is not cached
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as file:
+                data = file.read()
+            result = CachedResult(**json.loads(data))
+            os.utime(entry_path)
+        except (OSError, ValueError, TypeError):
+            self._discard(key)
+            return None
+        self._add(key, len(data))
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        """
+        Cache the result of a key, and evict the least recently used entries if the cache is over the size limit
+        :param key: the key of the command file
+        :param result: the result of the command file
+        :return: no return value
+        """
+        data = json.dumps(asdict(result)).encode("utf-8")
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, self._entry_path(key))
+        self._add(key, len(data))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache is within the size limit
+        :return: no return value
+        """
+        while self.total > self.max_bytes and self.sizes:
+            key, size = self.sizes.popitem(last=False)
+            self.total -= size
+            try:
+                os.remove(self._entry_path(key))
+            except FileNotFoundError:
+                pass
@@ -1,19 +1,25 @@
 """
 Robot class for the toy robot game
 """
-from typing import Optional, List
+import asyncio
+import threading
+from typing import Optional, List, AsyncIterable
 
 from toy_robot.command_interpreter import CommandsInterpreter
-from toy_robot.commands import Command
 from toy_robot.models import Position, Navigator, RobotPrototype
+from toy_robot.planner import plan_route, MOVE, LEFT, RIGHT
+
+PLACE_FIRST_MESSAGE = (
+    "Please use PLACE command to put the robot on the table first, "
+    "then you can order the robot to move"
+)
+REFUSE_MESSAGE = "This movement may endanger the robot, refuse to move"
 
 
 def _ensure_place_command_first(func):
     def wrapper(robot, *args):
         if not robot.current_position:
-            print(
-                "Please use PLACE command to put the robot on the table first, then you can order the robot to move"
-            )
+            print(PLACE_FIRST_MESSAGE)
         else:
             func(robot, *args)
 
@@ -59,13 +65,101 @@ class Robot(RobotPrototype):
         if self.navigator.safe(position):
             self.current_position = position
         else:
-            print("This movement may endanger the robot, refuse to move")
+            print(REFUSE_MESSAGE)
+
+    @_ensure_place_command_first
+    def goto(self, position: Position) -> None:
+        assert self.current_position is not None
+        if not self.navigator.safe(position):
+            print(REFUSE_MESSAGE)
+            return
+        orders = {MOVE: self.move_forward, LEFT: self.turn_left, RIGHT: self.turn_right}
+        route = plan_route(self.navigator.table, self.current_position, position)
+        for order in route:
+            orders[order]()
 
     @_ensure_place_command_first
     def report(self) -> None:
         print(f"Output: {self.current_position}")
 
+    def reset(self) -> None:
+        self.current_position = None
+
+    def await_orders(self, commands: List[str]):
+        with self.command_interpreter.spool(commands) as cmds:
+            for cmd in cmds:
+                cmd.execute()
+
+    async def await_orders_async(
+        self, commands: AsyncIterable[str], yield_every: int = 100
+    ):
+        """
+        Robot is ready for the commands from an async source, each command is executed as soon as it arrives, and
+        the robot yields to the event loop every yield_every commands
+        :param commands: async iterable of string typed commands
+        :param yield_every: how many commands to execute before yielding to the event loop, at least 1
+        :return: no return value
+        """
+        if yield_every < 1:
+            raise ValueError("yield_every should be at least 1")
+        executed = 0
+        async for command_text in commands:
+            for cmd in self.command_interpreter.iter_interpret((command_text,)):
+                cmd.execute()
+                executed += 1
+                if executed % yield_every == 0:
+                    await asyncio.sleep(0)
+
+
+class ThreadSafeRobot(Robot):
+    """
+    A robot which can be shared by multiple threads. Every state transition is done under a per-robot lock, and
+    turning replaces the current position instead of changing it in place, so a position read from the robot never
+    changes afterwards. A batch of orders holds the lock once for the whole batch.
+    """
+
+    def __init__(self, navigator: Navigator, position: Optional[Position] = None):
+        self.lock = threading.RLock()
+        super().__init__(navigator, position)
+
+    def set_position(self, position: Position) -> None:
+        with self.lock:
+            super().set_position(position)
+
+    def turn_left(self) -> None:
+        with self.lock:
+            self._turn("left")
+
+    def turn_right(self) -> None:
+        with self.lock:
+            self._turn("right")
+
+    @_ensure_place_command_first
+    def _turn(self, relative_facing: str) -> None:
+        assert self.current_position is not None
+        position = self.current_position
+        turned = Position(position.x, position.y, position.facing)
+        turned.change_facing_to(relative_facing)
+        self.current_position = turned
+
+    def move_forward(self) -> None:
+        with self.lock:
+            super().move_forward()
+
+    def goto(self, position: Position) -> None:
+        with self.lock:
+            super().goto(position)
+
+    def report(self) -> None:
+        with self.lock:
+            super().report()
+
+    def reset(self) -> None:
+        with self.lock:
+            super().reset()
+
     def await_orders(self, commands: List[str]):
-        cmds: List[Command] = self.command_interpreter.interpret(commands)
-        for cmd in cmds:
-            cmd.execute()
+        with self.command_interpreter.spool(commands) as cmds:
+            with self.lock:
+                for cmd in cmds:
+                    cmd.execute()
@@ -0,0 +1,153 @@
+"""
+Command spool for huge command lists. Translated commands are kept in memory until they exceed a memory budget, the
+rest are encoded into a temporary file, a few bytes per command, and decoded back into commands while they are
+iterated, so a whole input can be validated before any command is executed without holding every command in memory
+"""
+import struct
+import sys
+import tempfile
+from typing import Callable, IO, Iterable, Iterator, List, Optional
+
+from toy_robot.commands import (
+    Command,
+    GotoCommand,
+    LeftCommand,
+    MoveCommand,
+    PlaceCommand,
+    ReportCommand,
+    RightCommand,
+)
+from toy_robot.models import Facing, RobotPrototype
+
+# bytes of a reference in a list
+REFERENCE_SIZE = 8
+
+_MOVE, _LEFT, _RIGHT, _REPORT, _PLACE, _GOTO, _TEXT = range(7)
+_SIMPLE_OPCODES = {
+    MoveCommand: _MOVE,
+    LeftCommand: _LEFT,
+    RightCommand: _RIGHT,
+    ReportCommand: _REPORT,
+}
+_POSITION_OPCODES = {PlaceCommand: _PLACE, GotoCommand: _GOTO}
+_POSITION = struct.Struct("<iib")
+# positions out of the int32 range of _POSITION are spilled as their text
+_POSITION_RANGE = range(-(2**31), 2**31)
+_TEXT_LENGTH = struct.Struct("<I")
+
+
+def estimate_size(command: Command) -> int:
+    """
+    Estimate the memory held by a command, including the objects of its attributes, except the robot
+    :param command: the command
+    :return: bytes
+    """
+    size = sys.getsizeof(command) + sys.getsizeof(vars(command))
+    for name, value in vars(command).items():
+        if name != "robot" and hasattr(value, "__dict__"):
+            size += sys.getsizeof(value) + sys.getsizeof(vars(value))
+    return size
+
+
+class CommandSpool:
+    """
+    Commands kept in memory within a memory budget and spilled to a temporary file over it. The commands which are
+    neither PLACE, GOTO, MOVE, LEFT, RIGHT nor REPORT are spilled as their text and interpreted again when they are
+    read back. The spool can be iterated many times, and should be closed to remove the temporary file.
+    """
+
+    def __init__(
+        self,
+        robot: RobotPrototype,
+        reinterpret: Callable[[str], Iterable[Command]],
+        memory_budget: Optional[int] = None,
+        commands: Optional[List[Command]] = None,
+    ):
+        self.robot = robot
+        self.reinterpret = reinterpret
+        self.memory_budget = memory_budget
+        self.commands: List[Command] = commands if commands is not None else []
+        self.memory_size = len(self.commands) * REFERENCE_SIZE
+        self.spilled = 0
+        self.file: Optional[IO[bytes]] = None
+
+    def append(self, command: Command, command_text: str, size: int) -> None:
+        """
+        Append a command, it is spilled if the memory budget is exceeded
+        :param command: the translated command
+        :param command_text: the text the command is translated from
+        :param size: the memory held by the command if it is kept in memory
+        :return: no return value
+        """
+        if self.file is None:
+            self.memory_size += size
+            if self.memory_budget is None or self.memory_size <= self.memory_budget:
+                self.commands.append(command)
+                return
+            self.file = tempfile.TemporaryFile()  # pylint: disable=consider-using-with
+        self.file.write(self._encode(command, command_text))
+        self.spilled += 1
+
+    @staticmethod
+    def _encode(command: Command, command_text: str) -> bytes:
+        kind = type(command)
+        if kind in _SIMPLE_OPCODES:
+            return bytes((_SIMPLE_OPCODES[kind],))
+        if (
+            isinstance(command, (PlaceCommand, GotoCommand))
+            and kind in _POSITION_OPCODES
+            and command.position.x in _POSITION_RANGE
+            and command.position.y in _POSITION_RANGE
+        ):
+            position = command.position
+            return bytes((_POSITION_OPCODES[kind],)) + _POSITION.pack(
+                position.x, position.y, position.facing.value
+            )
+        text = command_text.encode("utf-8")
+        return bytes((_TEXT,)) + _TEXT_LENGTH.pack(len(text)) + text
+
+    def __iter__(self) -> Iterator[Command]:
+        yield from self.commands
+        if self.file is None:
+            return
+        file = self.file
+        file.flush()
+        file.seek(0)
+        robot = self.robot
+        simple_commands = [
+            MoveCommand(robot),
+            LeftCommand(robot),
+            RightCommand(robot),
+            ReportCommand(robot),
+        ]
+        for _ in range(self.spilled):
+            opcode = file.read(1)[0]
+            if opcode < _PLACE:
+                yield simple_commands[opcode]
+            elif opcode < _TEXT:
+                x, y, facing = _POSITION.unpack(file.read(_POSITION.size))
+                command_class = PlaceCommand if opcode == _PLACE else GotoCommand
+                yield command_class(robot, x, y, Facing(facing))
+            else:
+                (length,) = _TEXT_LENGTH.unpack(file.read(_TEXT_LENGTH.size))
+                yield from self.reinterpret(file.read(length).decode("utf-8"))
+        file.seek(0, 2)
+
+    def __len__(self) -> int:
+        return len(self.commands) + self.spilled
+
+    def close(self) -> None:
+        """
+        Remove the temporary file
+        :return: no return value
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.spilled = 0
+
+    def __enter__(self) -> "CommandSpool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
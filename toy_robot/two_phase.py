@@ -0,0 +1,209 @@
+"""
+Two phase run of a command file over a memory map. Like await_orders, no command is executed unless the whole file is
+valid, but instead of holding the translated commands of the whole file, the first phase scans the mapped file to
+validate it and keeps nothing, the second phase scans the same mapped file again and orders the robot directly for the
+built-in commands, so the memory used does not grow with the file size. A KernelRobot executes the translated
+commands of the second phase with the kernel of its table instead. The batch tools which need the commands themselves
+iterate them with their line numbers by iter_file_commands, which validates the file in the same way
+"""
+import mmap
+import re
+from functools import partial
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple, Union
+
+from toy_robot.command_interpreter import (
+    CommandError,
+    CommandsInterpreter,
+    GotoCommandTranslator,
+    PlaceCommandTranslator,
+    _translate_position,
+    translate,
+)
+from toy_robot.commands import Command
+from toy_robot.kernels import KernelRobot, execute_commands
+from toy_robot.models import Position
+from toy_robot.robot import Robot
+
+
+class LineCommandError(CommandError):
+    """
+    A CommandError of a line of a command file, the message is the same as the original error
+    """
+
+    def __init__(self, message: str, line_number: int):
+        super().__init__(message)
+        self.line_number = line_number
+
+
+# splits a line after each "\r" which is not followed by "\n"
+_AFTER_CR = re.compile(rb"(?<=\r)(?!\n)")
+
+
+def iter_raw_lines(stream: Union[BinaryIO, mmap.mmap]) -> Iterator[bytes]:
+    """
+    Iterate the lines of a binary file or a mapped file from its current position, a line ends at "\n", "\r\n" or "\r"
+    like a file opened in text mode, and keeps its line break, so the byte offsets of the lines add up
+    :param stream: the binary file or the mapped file
+    :return: iterator of the lines
+    """
+    for line in iter(stream.readline, b""):
+        if b"\r" in line:
+            yield from filter(None, _AFTER_CR.split(line))
+        else:
+            yield line
+
+
+def iter_lines(buffer: mmap.mmap) -> Iterator[str]:
+    """
+    Iterate the lines of a mapped file from the beginning, like a file opened in text mode, a line ends at "\n", "\r\n"
+    or "\r", and its line break is translated to "\n"
+    :param buffer: the mapped file
+    :return: iterator of the lines
+    """
+    buffer.seek(0)
+    if buffer.find(b"\r") < 0:
+        for line in iter(buffer.readline, b""):
+            yield line.decode("utf-8")
+        return
+    for line in iter_raw_lines(buffer):
+        text = line.decode("utf-8")
+        if text.endswith("\r\n"):
+            text = text[:-2] + "\n"
+        elif text.endswith("\r"):
+            text = text[:-1] + "\n"
+        yield text
+
+
+def direct_orders(
+    robot: Robot, interpreter: CommandsInterpreter
+) -> Dict[str, Callable[[List[str]], Callable[[], None]]]:
+    """
+    The order makers of the built-in commands which are still interpreted by the built-in translators, keyed by the
+    command names, a maker takes the args of the command and returns an order which calls the robot the same way as
+    the command would do
+    :param robot: the robot to order
+    :param interpreter: the interpreter of the robot
+    :return: the order makers keyed by the command names
+    """
+    makers: Dict[str, Callable[[List[str]], Callable[[], None]]] = {}
+    simple_orders = {
+        "MOVE": robot.move_forward,
+        "LEFT": robot.turn_left,
+        "RIGHT": robot.turn_right,
+        "REPORT": robot.report,
+    }
+    for cmd, order in simple_orders.items():
+        translator = interpreter.translators.get(cmd)
+        if translator is not None and translator.translate.__func__ is translate:
+            makers[cmd] = partial(_simple_order, order)
+
+    def place(args: List[str]) -> Callable[[], None]:
+        x, y, facing = _translate_position("PLACE", tuple(args))
+        return lambda: robot.set_position(Position(x, y, facing))
+
+    def goto(args: List[str]) -> Callable[[], None]:
+        return partial(robot.goto, Position(*_translate_position("GOTO", tuple(args))))
+
+    if interpreter.translators.get("PLACE") is PlaceCommandTranslator:
+        makers["PLACE"] = place
+    if interpreter.translators.get("GOTO") is GotoCommandTranslator:
+        makers["GOTO"] = goto
+    for name in interpreter.macros:
+        makers.pop(name, None)
+    return makers
+
+
+def _simple_order(order: Callable[[], None], _: List[str]) -> Callable[[], None]:
+    return order
+
+
+def _no_order() -> None:
+    pass
+
+
+def run_file(robot: Robot, commands_filepath: str) -> None:
+    """
+    Validate all the commands of a file, then execute them, the same as robot.await_orders(file.readlines())
+    :param robot: the robot to execute the commands
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :return: no return value
+    """
+    interpreter = robot.command_interpreter
+    with open(commands_filepath, "rb") as file:
+        if not file.seek(0, 2):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            _validate(interpreter, buffer)
+            if isinstance(robot, KernelRobot):
+                execute_commands(robot, interpreter.iter_interpret(iter_lines(buffer)))
+                return
+
+            makers = direct_orders(robot, interpreter)
+            prepared: Dict[str, Callable[[], None]] = {}
+            for command_text in iter_lines(buffer):
+                order = prepared.get(command_text)
+                if order is None:
+                    order = _prepare(interpreter, makers, command_text)
+                    if len(prepared) < interpreter.max_shared_commands:
+                        prepared[command_text] = order
+                order()
+
+
+def iter_file_commands(
+    robot: Robot, commands_filepath: str
+) -> Iterator[Tuple[int, Command]]:
+    """
+    Validate all the commands of a file like run_file, then iterate the commands with their line numbers, the commands
+    are translated again line by line instead of being held, a LineCommandError is raised before the first command if
+    the file is invalid
+    :param robot: the robot to execute the commands
+    :param commands_filepath: the path of the file which contains a bunch of commands
+    :return: iterator of the line numbers and the commands
+    """
+    interpreter = robot.command_interpreter
+    with open(commands_filepath, "rb") as file:
+        if not file.seek(0, 2):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            _validate(interpreter, buffer)
+            for line_number, command_text in enumerate(iter_lines(buffer), 1):
+                for command in interpreter.iter_interpret((command_text,)):
+                    yield line_number, command
+
+
+def _validate(interpreter: CommandsInterpreter, buffer: mmap.mmap) -> None:
+    """
+    The first phase, interpret all the lines of the mapped file and keep nothing, the error of the first invalid line
+    is raised as a LineCommandError
+    """
+    line_number = 0
+
+    def numbered_lines() -> Iterator[str]:
+        nonlocal line_number
+        for line_number, command_text in enumerate(iter_lines(buffer), 1):
+            yield command_text
+
+    try:
+        for _ in interpreter.iter_interpret(numbered_lines()):
+            pass
+    except CommandError as e:
+        raise LineCommandError(e.args[0], line_number) from e
+
+
+def _prepare(
+    interpreter: CommandsInterpreter,
+    makers: Dict[str, Callable[[List[str]], Callable[[], None]]],
+    command_text: str,
+) -> Callable[[], None]:
+    cmd_and_args = command_text.strip().split(" ")
+    maker = makers.get(cmd_and_args[0].upper())
+    if maker is not None:
+        return maker(cmd_and_args[1:])
+    if not cmd_and_args[0]:
+        return _no_order
+
+    def execute() -> None:
+        for command in interpreter.iter_interpret((command_text,)):
+            command.execute()
+
+    return execute